@@ -4,19 +4,22 @@ Provides tools for measuring intent classification, agent performance,
 RAG retrieval quality, end-to-end task completion, and response quality.
 """
 
-from .runner import EvaluationRunner
-from .report import ReportGenerator
-from .metrics import (
-    compute_classification_metrics,
-    compute_retrieval_metrics,
-    compute_task_completion_rate,
-)
+import importlib
 
-__all__ = [
-    "EvaluationRunner",
-    "ReportGenerator",
-    "compute_classification_metrics",
-    "compute_retrieval_metrics",
-    "compute_task_completion_rate",
-]
+# Exports are imported on first access, so importing a light submodule
+# (e.g. evaluation.datasets) does not load NumPy and every evaluator
+_LAZY_EXPORTS = {
+    "EvaluationRunner": ".runner",
+    "ReportGenerator": ".report",
+    "compute_classification_metrics": ".metrics",
+    "compute_retrieval_metrics": ".metrics",
+    "compute_task_completion_rate": ".metrics",
+}
 
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,15 +3,31 @@ Test datasets for evaluation framework.
 """
 
 import json
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson  # 3-5x faster than stdlib json
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import ijson  # incremental parser: read only the first items of a list
+except ImportError:
+    ijson = None
 
 DATASETS_DIR = Path(__file__).parent
 
 
+@lru_cache(maxsize=32)
 def load_dataset(name: str) -> Dict[str, Any]:
     """
-    Load a dataset by name.
+    Load a dataset by name (parsed once, then cached).
+
+    The returned object is shared between callers: deep-copy it before mutating.
     
     Args:
         name: Dataset name (without .json extension)
@@ -23,11 +39,46 @@ def load_dataset(name: str) -> Dict[str, Any]:
     if not file_path.exists():
         raise FileNotFoundError(f"Dataset not found: {name}")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _loads(file_path.read_bytes())
+
+
+def load_test_cases(name: str, key: str = "test_cases", limit: Optional[int] = None) -> List[Any]:
+    """
+    Load the items of one list of a dataset, optionally only the first ones.
+    
+    With a limit (and ijson installed) the file is parsed only up to the last
+    item needed instead of materializing every list of the dataset.
+    
+    Args:
+        name: Dataset name (without .json extension)
+        key: Top-level key of the list (e.g. "test_cases", "rag_test_cases")
+        limit: Number of items to return (None: all of them)
+        
+    Returns:
+        List of items (a new list, the items themselves are shared)
+    """
+    if limit is None or ijson is None:
+        items = load_dataset(name).get(key, [])
+        return list(items if limit is None else items[:limit])
+    return list(_load_items_prefix(name, key, limit))
+
+
+@lru_cache(maxsize=32)
+def _load_items_prefix(name: str, key: str, limit: int) -> tuple:
+    file_path = DATASETS_DIR / f"{name}.json"
+    if not file_path.exists():
+        raise FileNotFoundError(f"Dataset not found: {name}")
+    
+    with open(file_path, "rb") as f:
+        return tuple(islice(ijson.items(f, f"{key}.item", use_float=True), limit))
+
+
+@lru_cache(maxsize=1)
+def _dataset_names() -> tuple:
+    return tuple(f.stem for f in DATASETS_DIR.glob("*.json"))
 
 
 def list_datasets() -> List[str]:
-    """List all available datasets."""
-    return [f.stem for f in DATASETS_DIR.glob("*.json")]
+    """List all available datasets (globbed once per process)."""
+    return list(_dataset_names())
 
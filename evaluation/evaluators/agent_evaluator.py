@@ -4,12 +4,33 @@ Measures performance of individual specialized agents.
 """
 
 import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable
 import re
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+# Test cases sent to a stateless agent (or classified by the intent evaluator) at the
+# same time, each one an independent LLM round-trip. EVAL_CONCURRENCY=1: one by one.
+EVAL_CONCURRENCY = int(os.getenv("EVAL_CONCURRENCY", "8"))
+
+# Response indicators, built once instead of on every test case
+_RESERVATION_SUCCESS_INDICATORS = ("confirmed", "reservation", "booked", "available", "cancelled", "table")
+_RESERVATION_FAILURE_INDICATORS = ("sorry", "error", "no tables", "unavailable", "missing", "provide")
+_ORDER_INFO_REQUEST_INDICATORS = ("name", "phone", "address", "contact", "provide", "need")
+
+# Reservation parameters in one sweep over the response. Each alternative sits in a
+# lookahead, so matches may overlap ("table 4 people" yields both table and guests).
+_RESERVATION_PARAMS_RE = re.compile(
+    r"(?=(?P<date>\d{4}-\d{2}-\d{2})"
+    r"|(?P<time>\d{1,2}:\d{2})"
+    r"|(?P<guests>\d+)\s*(?:guests?|people|persons?)"
+    r"|table\s*(?:#|number)?\s*(?P<table>\d+))"
+)
+_RESERVATION_PARAM_COUNT = _RESERVATION_PARAMS_RE.groups
+
 
 class AgentEvaluator:
     """
@@ -21,8 +42,18 @@ class AgentEvaluator:
     - Order Agent: Order parsing, confirmation handling
     """
 
-    def __init__(self):
-        """Initialize the agent evaluator."""
+    def __init__(self, concurrency: int = EVAL_CONCURRENCY, stateful_concurrency: int = 1):
+        """
+        Initialize the agent evaluator.
+        
+        Args:
+            concurrency: Test cases evaluated in parallel for the general agent (1 = sequential)
+            stateful_concurrency: Same for the reservation and order agents. Their cases
+                                  book tables and place orders that later cases depend on,
+                                  so they run one by one unless raised explicitly.
+        """
+        self.concurrency = concurrency
+        self.stateful_concurrency = stateful_concurrency
         self.results = {
             "reservation": [],
             "general": [],
@@ -44,64 +75,9 @@ class AgentEvaluator:
         Returns:
             Evaluation metrics for reservation agent
         """
-        results = []
-        
-        for case in test_cases:
-            input_text = case.get("input", "")
-            expected_action = case.get("expected_action")  # e.g., "make_reservation", "check_availability"
-            expected_params = case.get("expected_params", {})
-            expected_success = case.get("expected_success", True)
-            
-            try:
-                response = agent.process(input_text)
-                
-                # Analyze response for success indicators
-                success_indicators = [
-                    "confirmed", "reservation", "booked", "available",
-                    "cancelled", "table"
-                ]
-                failure_indicators = [
-                    "sorry", "error", "no tables", "unavailable", 
-                    "missing", "provide"
-                ]
-                
-                response_lower = response.lower() if isinstance(response, str) else ""
-                
-                has_success = any(ind in response_lower for ind in success_indicators)
-                has_failure = any(ind in response_lower for ind in failure_indicators)
-                
-                # Determine if task succeeded
-                if expected_success:
-                    task_success = has_success and not has_failure
-                else:
-                    task_success = has_failure
-                
-                # Check parameter extraction
-                params_extracted = self._extract_reservation_params(response_lower)
-                params_match = self._compare_params(expected_params, params_extracted)
-                
-                result = {
-                    "input": input_text,
-                    "response": response,
-                    "expected_action": expected_action,
-                    "task_success": task_success,
-                    "params_extracted": params_extracted,
-                    "params_match": params_match,
-                    "error": None
-                }
-                
-            except Exception as e:
-                result = {
-                    "input": input_text,
-                    "response": None,
-                    "expected_action": expected_action,
-                    "task_success": False,
-                    "params_extracted": {},
-                    "params_match": False,
-                    "error": str(e)
-                }
-            
-            results.append(result)
+        results = self._map_cases(
+            lambda case: self._evaluate_reservation_case(agent, case), test_cases, self.stateful_concurrency
+        )
         
         self.results["reservation"] = results
         return self._compute_agent_metrics(results, "reservation")
@@ -145,47 +121,7 @@ class AgentEvaluator:
         Returns:
             Evaluation metrics for general agent
         """
-        results = []
-        
-        for case in test_cases:
-            input_text = case.get("input", "")
-            expected_keywords = case.get("expected_keywords", [])
-            expected_topic = case.get("expected_topic", "")
-            
-            try:
-                response = agent.process(input_text)
-                response_str = str(response) if response else ""
-                response_lower = response_str.lower()
-                
-                # Check keyword presence
-                keywords_found = [
-                    kw for kw in expected_keywords 
-                    if kw.lower() in response_lower
-                ]
-                keyword_coverage = len(keywords_found) / len(expected_keywords) if expected_keywords else 1.0
-                
-                result = {
-                    "input": input_text,
-                    "response": response_str,
-                    "expected_topic": expected_topic,
-                    "keywords_found": keywords_found,
-                    "keyword_coverage": keyword_coverage,
-                    "success": keyword_coverage >= 0.5,
-                    "error": None
-                }
-                
-            except Exception as e:
-                result = {
-                    "input": input_text,
-                    "response": None,
-                    "expected_topic": expected_topic,
-                    "keywords_found": [],
-                    "keyword_coverage": 0.0,
-                    "success": False,
-                    "error": str(e)
-                }
-            
-            results.append(result)
+        results = self._map_cases(lambda case: self._evaluate_general_case(agent, case), test_cases)
         
         self.results["general"] = results
         return self._compute_agent_metrics(results, "general")
@@ -205,82 +141,172 @@ class AgentEvaluator:
         Returns:
             Evaluation metrics for order agent
         """
-        results = []
-        
-        for case in test_cases:
-            input_text = case.get("input", "")
-            expected_items = case.get("expected_items", [])
-            expected_action = case.get("expected_action", "place_order")
-            
-            try:
-                response = agent.process(input_text)
-                response_str = str(response) if response else ""
-                response_lower = response_str.lower()
-                
-                # Check if expected items are mentioned or if agent is asking for required info
-                items_found = [
-                    item for item in expected_items
-                    if item.lower() in response_lower
-                ]
-
-                # Consider it successful if items are mentioned OR agent is appropriately asking for info
-                asking_for_info = any(keyword in response_lower for keyword in [
-                    "name", "phone", "address", "contact", "provide", "need"
-                ])
-
-                # Success if: items found, OR agent is asking for required information to complete the order
-                is_success = (len(items_found) >= len(expected_items) * 0.5 if expected_items else True) or \
-                            (asking_for_info and expected_action == "place_order")
-
-                result = {
-                    "input": input_text,
-                    "response": response_str,
-                    "expected_action": expected_action,
-                    "expected_items": expected_items,
-                    "items_found": items_found,
-                    "success": is_success,
-                    "error": None
-                }
-                
-            except Exception as e:
-                result = {
-                    "input": input_text,
-                    "response": None,
-                    "expected_action": expected_action,
-                    "expected_items": expected_items,
-                    "items_found": [],
-                    "success": False,
-                    "error": str(e)
-                }
-            
-            results.append(result)
+        results = self._map_cases(
+            lambda case: self._evaluate_order_case(agent, case), test_cases, self.stateful_concurrency
+        )
         
         self.results["order"] = results
         return self._compute_agent_metrics(results, "order")
     
+    def _evaluate_reservation_case(self, agent, case: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one reservation test case through the agent."""
+        input_text = case.get("input", "")
+        expected_action = case.get("expected_action")  # e.g., "make_reservation", "check_availability"
+        expected_params = case.get("expected_params", {})
+        expected_success = case.get("expected_success", True)
+        
+        try:
+            response = agent.process(input_text)
+        
+            # Analyze response for success indicators
+            response_lower = response.lower() if isinstance(response, str) else ""
+        
+            has_success = any(ind in response_lower for ind in _RESERVATION_SUCCESS_INDICATORS)
+            has_failure = any(ind in response_lower for ind in _RESERVATION_FAILURE_INDICATORS)
+        
+            # Determine if task succeeded
+            if expected_success:
+                task_success = has_success and not has_failure
+            else:
+                task_success = has_failure
+        
+            # Check parameter extraction
+            params_extracted = self._extract_reservation_params(response_lower)
+            params_match = self._compare_params(expected_params, params_extracted)
+        
+            result = {
+                "input": input_text,
+                "response": response,
+                "expected_action": expected_action,
+                "task_success": task_success,
+                "params_extracted": params_extracted,
+                "params_match": params_match,
+                "error": None
+            }
+        
+        except Exception as e:
+            result = {
+                "input": input_text,
+                "response": None,
+                "expected_action": expected_action,
+                "task_success": False,
+                "params_extracted": {},
+                "params_match": False,
+                "error": str(e)
+            }
+        
+        return result
+    
+    def _evaluate_general_case(self, agent, case: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one general inquiry test case through the agent."""
+        input_text = case.get("input", "")
+        expected_keywords = case.get("expected_keywords", [])
+        expected_topic = case.get("expected_topic", "")
+        
+        try:
+            response = agent.process(input_text)
+            response_str = str(response) if response else ""
+            response_lower = response_str.lower()
+        
+            # Check keyword presence
+            keywords_found = [
+                kw for kw in expected_keywords 
+                if kw.lower() in response_lower
+            ]
+            keyword_coverage = len(keywords_found) / len(expected_keywords) if expected_keywords else 1.0
+        
+            result = {
+                "input": input_text,
+                "response": response_str,
+                "expected_topic": expected_topic,
+                "keywords_found": keywords_found,
+                "keyword_coverage": keyword_coverage,
+                "success": keyword_coverage >= 0.5,
+                "error": None
+            }
+        
+        except Exception as e:
+            result = {
+                "input": input_text,
+                "response": None,
+                "expected_topic": expected_topic,
+                "keywords_found": [],
+                "keyword_coverage": 0.0,
+                "success": False,
+                "error": str(e)
+            }
+        
+        return result
+    
+    def _evaluate_order_case(self, agent, case: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one order test case through the agent."""
+        input_text = case.get("input", "")
+        expected_items = case.get("expected_items", [])
+        expected_action = case.get("expected_action", "place_order")
+        
+        try:
+            response = agent.process(input_text)
+            response_str = str(response) if response else ""
+            response_lower = response_str.lower()
+        
+            # Check if expected items are mentioned or if agent is asking for required info
+            items_found = [
+                item for item in expected_items
+                if item.lower() in response_lower
+            ]
+        
+            # Consider it successful if items are mentioned OR agent is appropriately asking for info
+            asking_for_info = any(keyword in response_lower for keyword in _ORDER_INFO_REQUEST_INDICATORS)
+        
+            # Success if: items found, OR agent is asking for required information to complete the order
+            is_success = (len(items_found) >= len(expected_items) * 0.5 if expected_items else True) or \
+                        (asking_for_info and expected_action == "place_order")
+        
+            result = {
+                "input": input_text,
+                "response": response_str,
+                "expected_action": expected_action,
+                "expected_items": expected_items,
+                "items_found": items_found,
+                "success": is_success,
+                "error": None
+            }
+        
+        except Exception as e:
+            result = {
+                "input": input_text,
+                "response": None,
+                "expected_action": expected_action,
+                "expected_items": expected_items,
+                "items_found": [],
+                "success": False,
+                "error": str(e)
+            }
+        
+        return result
+    
+    def _map_cases(self, evaluate_case: Callable, test_cases: List[Dict[str, Any]],
+                   concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Evaluate test cases concurrently (default: self.concurrency), results in test case order."""
+        concurrency = self.concurrency if concurrency is None else concurrency
+        if concurrency <= 1 or len(test_cases) <= 1:
+            return [evaluate_case(case) for case in test_cases]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(test_cases))) as executor:
+            return list(executor.map(evaluate_case, test_cases))
+    
     def _extract_reservation_params(self, response: str) -> Dict[str, Any]:
         """Extract reservation parameters from response text."""
         params = {}
         
-        # Date pattern: YYYY-MM-DD
-        date_match = re.search(r'\d{4}-\d{2}-\d{2}', response)
-        if date_match:
-            params["date"] = date_match.group()
-        
-        # Time pattern: HH:MM
-        time_match = re.search(r'\d{1,2}:\d{2}', response)
-        if time_match:
-            params["time"] = time_match.group()
-        
-        # Guests: number + guests/people/persons
-        guests_match = re.search(r'(\d+)\s*(?:guests?|people|persons?)', response)
-        if guests_match:
-            params["guests"] = int(guests_match.group(1))
-        
-        # Table number
-        table_match = re.search(r'table\s*(?:#|number)?\s*(\d+)', response)
-        if table_match:
-            params["table"] = int(table_match.group(1))
+        # First occurrence of each of date (YYYY-MM-DD), time (HH:MM),
+        # guests (number + guests/people/persons) and table number
+        for match in _RESERVATION_PARAMS_RE.finditer(response):
+            name = match.lastgroup
+            if name not in params:
+                value = match.group(name)
+                params[name] = int(value) if name in ("guests", "table") else value
+                if len(params) == _RESERVATION_PARAM_COUNT:
+                    break  # all found, skip the rest of the response
         
         return params
     
@@ -11,6 +11,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from evaluation.metrics import compute_task_completion_rate
 
+# Words marking a turn whose response reports a problem
+_ERROR_INDICATORS = ("error", "sorry", "apologize", "problem", "couldn't")
+
 
 class EndToEndEvaluator:
     """
@@ -32,6 +35,9 @@ class EndToEndEvaluator:
         """
         self.voice_assistant = voice_assistant
         self.results = []
+        # compute_metrics() output, valid while len(self.results) is unchanged
+        self._metrics_cache = None
+        self._metrics_cache_len = -1
     
     def set_voice_assistant(self, voice_assistant):
         """Set or update the voice assistant instance."""
@@ -100,8 +106,7 @@ class EndToEndEvaluator:
                 ]
                 
                 # Check for error indicators
-                error_indicators = ["error", "sorry", "apologize", "problem", "couldn't"]
-                turn_had_error = any(ind in response_lower for ind in error_indicators)
+                turn_had_error = any(ind in response_lower for ind in _ERROR_INDICATORS)
                 
                 if turn_had_error and not expect_error:
                     had_error = True
@@ -170,6 +175,7 @@ class EndToEndEvaluator:
             Aggregated metrics across all scenarios
         """
         self.results = []  # Reset results
+        self._metrics_cache = None
         
         for scenario in scenarios:
             # Reset assistant state between scenarios
@@ -282,8 +288,12 @@ class EndToEndEvaluator:
         """
         if not self.results:
             return {"error": "No results to evaluate"}
+        if self._metrics_cache is not None and self._metrics_cache_len == len(self.results):
+            return self._metrics_cache
         
-        return compute_task_completion_rate(self.results)
+        self._metrics_cache = compute_task_completion_rate(self.results)
+        self._metrics_cache_len = len(self.results)
+        return self._metrics_cache
     
     def evaluate_context_retention(
         self,
@@ -364,6 +374,7 @@ class EndToEndEvaluator:
     def clear_results(self):
         """Clear accumulated results."""
         self.results = []
+        self._metrics_cache = None
     
     def get_summary(self) -> str:
         """
@@ -4,6 +4,7 @@ Measures the orchestrator's ability to correctly classify user intents.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
@@ -11,6 +12,7 @@ from typing import List, Dict, Any, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from evaluation.metrics import compute_classification_metrics
+from evaluation.evaluators.agent_evaluator import EVAL_CONCURRENCY
 
 
 class IntentEvaluator:
@@ -25,15 +27,20 @@ class IntentEvaluator:
     
     INTENT_CLASSES = ["general", "order", "reservation"]
     
-    def __init__(self, orchestrator=None):
+    def __init__(self, orchestrator=None, concurrency: int = EVAL_CONCURRENCY):
         """
         Initialize the evaluator.
         
         Args:
             orchestrator: The Orchestrator instance to evaluate
+            concurrency: Test cases classified in parallel by evaluate_batch
         """
         self.orchestrator = orchestrator
+        self.concurrency = concurrency
         self.results = []
+        # compute_metrics() output, valid while len(self.results) is unchanged
+        self._metrics_cache = None
+        self._metrics_cache_len = -1
     
     def set_orchestrator(self, orchestrator):
         """Set or update the orchestrator instance."""
@@ -50,21 +57,31 @@ class IntentEvaluator:
         Returns:
             Dictionary with input, expected, predicted, and correct flag
         """
+        result = self._classify(input_text, expected_intent)
+        self.results.append(result)
+        return result
+    
+    def _classify(self, input_text: str, expected_intent: str) -> Dict[str, Any]:
+        """Classify one input and compare it to the expected intent (not recorded)."""
         if self.orchestrator is None:
             raise ValueError("Orchestrator not set. Use set_orchestrator() first.")
         
-        # Get predicted intent
-        predicted_intent = self.orchestrator._classify_intent(input_text)
-        
-        result = {
+        # Get predicted intent the way a live turn is routed, but never from the
+        # intent cache: a cached intent would score an earlier (similar) test case
+        if getattr(self.orchestrator, "_fused_llm", None) is not None:
+            # Online: the fused routing call on the raw utterance (translate_and_classify)
+            predicted_intent, _ = self.orchestrator._pre_route(input_text, [])
+        else:
+            # Offline: keyword fast path, then the classifier (process_request)
+            predicted_intent = (self.orchestrator._fast_path_intent(input_text)
+                                or self.orchestrator._classify_intent(input_text, use_cache=False))
+        
+        return {
             "input": input_text,
             "expected": expected_intent,
             "predicted": predicted_intent,
             "correct": expected_intent == predicted_intent
         }
-        
-        self.results.append(result)
-        return result
     
     def evaluate_batch(self, test_cases: List[Dict[str, str]]) -> Dict[str, Any]:
         """
@@ -77,13 +94,20 @@ class IntentEvaluator:
             Dictionary with overall metrics and individual results
         """
         self.results = []  # Reset results
+        self._metrics_cache = None
         
-        for case in test_cases:
-            input_text = case.get("input", "")
-            expected = case.get("expected_intent", "")
-            
-            if input_text and expected:
-                self.evaluate_single(input_text, expected)
+        pairs = [
+            (case.get("input", ""), case.get("expected_intent", ""))
+            for case in test_cases
+        ]
+        pairs = [(input_text, expected) for input_text, expected in pairs if input_text and expected]
+        
+        if self.concurrency <= 1 or len(pairs) <= 1:
+            self.results.extend(self._classify(*pair) for pair in pairs)
+        else:
+            # Independent LLM calls: run them concurrently, keep the dataset order
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pairs))) as executor:
+                self.results.extend(executor.map(lambda pair: self._classify(*pair), pairs))
         
         return self.compute_metrics()
     
@@ -96,6 +120,8 @@ class IntentEvaluator:
         """
         if not self.results:
             return {"error": "No results to evaluate"}
+        if self._metrics_cache is not None and self._metrics_cache_len == len(self.results):
+            return self._metrics_cache
         
         y_true = [r["expected"] for r in self.results]
         y_pred = [r["predicted"] for r in self.results]
@@ -120,6 +146,8 @@ class IntentEvaluator:
         metrics["misclassifications"] = misclassifications
         metrics["misclassification_rate"] = len(misclassifications) / len(self.results)
         
+        self._metrics_cache = metrics
+        self._metrics_cache_len = len(self.results)
         return metrics
     
     def get_confusion_pairs(self) -> List[Dict[str, Any]]:
@@ -150,6 +178,7 @@ class IntentEvaluator:
     def clear_results(self):
         """Clear accumulated results."""
         self.results = []
+        self._metrics_cache = None
     
     def get_summary(self) -> str:
         """
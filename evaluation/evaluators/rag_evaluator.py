@@ -5,12 +5,23 @@ Includes Ragas-based evaluation for comprehensive RAG assessment.
 """
 
 import sys
+import hashlib
+from array import array
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from evaluation.metrics import compute_retrieval_metrics, compute_semantic_similarity
+from evaluation.metrics import compute_retrieval_metrics, compute_semantic_similarity_batch
 
 # Try to import Ragas (optional dependency)
 try:
@@ -30,11 +41,120 @@ try:
         except ImportError:
             Dataset = None
     RAGAS_AVAILABLE = True and Dataset is not None
+    try:
+        from ragas import __version__ as _RAGAS_VERSION
+    except ImportError:
+        _RAGAS_VERSION = "unknown"
 except ImportError:
     RAGAS_AVAILABLE = False
     Dataset = None
+    _RAGAS_VERSION = "unavailable"
     # Don't print warning here - let the user know when they try to use it
 
+RAGAS_METRIC_NAMES = ["answer_relevancy", "faithfulness", "context_precision", "context_recall"]
+
+# On-disk judge cache, shared by every run (delete the file to re-score everything)
+RAGAS_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "ragas_scores.sqlite"
+
+# (contexts, answer) of past Ragas queries (opt-in, see RAGEvaluator). Entries are
+# versioned by the agent source and the knowledge base file, stale ones never match.
+ANSWER_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "ragas_answers.sqlite"
+
+
+def _model_identity(model) -> str:
+    """Class and model name of a judge LLM / embeddings (Ragas wrappers unwrapped), "default" for None."""
+    if model is None:
+        return "default"  # Picked by Ragas itself, so versioned by _RAGAS_VERSION
+    inner = getattr(model, "langchain_llm", None) or getattr(model, "langchain_embeddings", None) or model
+    name = (getattr(inner, "model_name", None) or getattr(inner, "model", None)
+            or getattr(inner, "deployment", None) or "")
+    return f"{type(inner).__name__}:{name}"
+
+
+def _file_digest(path) -> bytes:
+    """sha256 of a file's content (empty if there is no such file)."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).digest()
+    except (OSError, TypeError):
+        return b""
+
+
+class _RagasScoreCache:
+    """
+    Per-sample Ragas scores keyed by sample content (in-memory LRU, optionally
+    backed by a sqlite file so re-runs of an unchanged test suite skip the judge).
+    Also stores the prepared (contexts, answer) of a query (see RAGEvaluator._answer_key).
+
+    Regression runs re-score the same canned (question, contexts, answer) samples
+    over and over; a cached sample skips the LLM judge entirely.
+    """
+
+    def __init__(self, max_size: int = 10000, path: Optional[Path] = None):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, result_json TEXT, ts REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(question: str, contexts: List[str], answer: str, ground_truth: str = "",
+            judge: str = "") -> str:
+        """
+        Content hash of a sample (whitespace-normalized), versioned by the judge setup:
+        the Ragas version and the judge identity (LLM and embedding models, see _judge_identity).
+        """
+        parts = [_RAGAS_VERSION, judge, question, "\x1f".join(contexts), answer, ground_truth or ""]
+        canonical = "\x1e".join(" ".join(part.split()) for part in parts)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is None and self._db is not None:
+                row = self._db.execute("SELECT result_json FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    scores = json.loads(row[0])
+                    self._remember(key, scores)
+            if scores is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return scores
+
+    def put(self, key: str, scores: Dict[str, float]):
+        with self._lock:
+            self._remember(key, scores)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, result_json, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(scores), time.time())
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, scores: Dict[str, float]):
+        self._entries[key] = scores
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every score, on disk too."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
 
 class RAGEvaluator:
     """
@@ -47,18 +167,43 @@ class RAGEvaluator:
     - Ragas metrics (if available): Answer Relevancy, Faithfulness, Context Precision/Recall
     """
     
-    def __init__(self, embeddings_manager=None, agent=None):
+    def __init__(self, embeddings_manager=None, agent=None, concurrency: int = 4,
+                 ragas_cache_path: Optional[Path] = RAGAS_CACHE_PATH,
+                 use_answer_cache: bool = False,
+                 answer_cache_path: Optional[Path] = None,
+                 ragas_llm=None, ragas_embeddings=None):
         """
         Initialize the RAG evaluator.
         
         Args:
             embeddings_manager: The EmbeddingsManager instance to evaluate
             agent: Optional agent instance (e.g., GeneralInqueriesAgent) to generate responses
+            concurrency: Test cases prepared in parallel for Ragas (agent calls are I/O bound).
+                         A local Ollama server only answers in parallel up to OLLAMA_NUM_PARALLEL,
+                         use 1 if it is not set.
+            ragas_cache_path: sqlite file persisting per-sample Ragas scores across runs
+                              (None: in-memory cache only)
+            use_answer_cache: Reuse the retrieved contexts and agent answer of a query
+                              already prepared with the same agent and knowledge base
+                              (off by default: a regression run must call the agent)
+            answer_cache_path: sqlite file persisting that cache across runs, e.g.
+                               ANSWER_CACHE_PATH (None: in-memory cache only)
+            ragas_llm: Judge LLM passed to ragas.evaluate (None: the Ragas default)
+            ragas_embeddings: Embeddings passed to ragas.evaluate (None: the Ragas default)
         """
         self.embeddings_manager = embeddings_manager
         self.agent = agent
+        self.concurrency = concurrency
         self.results = []
+        # Metric columns of self.results (one entry per result, contiguous C buffers)
+        self._reciprocal_ranks = array('d')
+        self._precisions = array('d')
+        self._hit_flags = array('b')
         self.ragas_results = []
+        self._ragas_cache = _RagasScoreCache(path=ragas_cache_path)
+        self.ragas_llm = ragas_llm
+        self.ragas_embeddings = ragas_embeddings
+        self._answer_cache = _RagasScoreCache(path=answer_cache_path) if use_answer_cache else None
     
     def set_embeddings_manager(self, embeddings_manager):
         """Set or update the embeddings manager."""
@@ -158,6 +303,9 @@ class RAGEvaluator:
         }
         
         self.results.append(result)
+        self._reciprocal_ranks.append(reciprocal_rank)
+        self._precisions.append(precision_at_k)
+        self._hit_flags.append(1 if hit_at_k else 0)
         return result
     
     def evaluate_batch(
@@ -175,7 +323,7 @@ class RAGEvaluator:
         Returns:
             Aggregated metrics across all queries
         """
-        self.results = []  # Reset results
+        self.clear_results()  # Reset results
         
         all_results = {k: [] for k in k_values}
         
@@ -226,24 +374,39 @@ class RAGEvaluator:
             if not results:
                 continue
             
-            valid_results = [r for r in results if r.get("error") is None]
-            error_count = len(results) - len(valid_results)
+            score_matrix = self._score_matrix(results)
+            error_count = len(results) - len(score_matrix)
             
-            if valid_results:
+            if len(score_matrix):
+                mrr, precision, hit_rate = score_matrix.mean(axis=0)
+                
                 # MRR (use first k's results for MRR)
                 if k == k_values[0]:
-                    metrics["mrr"] = sum(r["reciprocal_rank"] for r in valid_results) / len(valid_results)
-                    metrics["total_queries"] = len(valid_results)
+                    metrics["mrr"] = float(mrr)
+                    metrics["total_queries"] = len(score_matrix)
                     metrics["errors"] = error_count
                 
                 # Precision@K
-                metrics["precision_at_k"][k] = sum(r["precision_at_k"] for r in valid_results) / len(valid_results)
+                metrics["precision_at_k"][k] = float(precision)
                 
                 # Hit Rate@K
-                metrics["hit_rate_at_k"][k] = sum(1 for r in valid_results if r["hit_at_k"]) / len(valid_results)
+                metrics["hit_rate_at_k"][k] = float(hit_rate)
         
         return metrics
     
+    def _columns_in_sync(self) -> bool:
+        """True unless self.results was modified without going through evaluate_single."""
+        return len(self._hit_flags) == len(self._precisions) == len(self._reciprocal_ranks) == len(self.results)
+    
+    @staticmethod
+    def _score_matrix(results: List[Dict[str, Any]]) -> np.ndarray:
+        """(N, 3) matrix of reciprocal rank, precision@K and hit@K for the results without error."""
+        rows = [
+            (r["reciprocal_rank"], r["precision_at_k"], r["hit_at_k"])
+            for r in results if r.get("error") is None
+        ]
+        return np.array(rows, dtype=np.float64).reshape(len(rows), 3)
+    
     def evaluate_semantic_quality(
         self,
         test_cases: List[Dict[str, Any]],
@@ -262,7 +425,8 @@ class RAGEvaluator:
         if self.embeddings_manager is None:
             raise ValueError("EmbeddingsManager not set.")
         
-        similarities = []
+        # (query, retrieved text, retrieval score) for every top result
+        pairs = []
         
         for case in test_cases:
             query = case.get("query", "")
@@ -274,17 +438,31 @@ class RAGEvaluator:
             if isinstance(results, str):  # Error
                 continue
             
-            # Compute similarity between query and top results
             for result in results:
                 text = result.get("text", "")
                 if text:
-                    sim = compute_semantic_similarity(query, text, embedding_function)
-                    similarities.append({
-                        "query": query,
-                        "retrieved_text": text[:100],
-                        "similarity": sim,
-                        "retrieval_score": result.get("score", 0)
-                    })
+                    pairs.append((query, text, result.get("score", 0)))
+        
+        # Compute similarity between queries and top results in one batch
+        # (each query is embedded once, not once per retrieved result)
+        batch_embedding_function = None
+        if embedding_function is not None:
+            batch_embedding_function = lambda texts: np.stack([embedding_function(t) for t in texts])
+        sims = compute_semantic_similarity_batch(
+            [query for query, _, _ in pairs],
+            [text for _, text, _ in pairs],
+            batch_embedding_function
+        )
+        
+        similarities = [
+            {
+                "query": query,
+                "retrieved_text": text[:100],
+                "similarity": float(sim),
+                "retrieval_score": score
+            }
+            for (query, text, score), sim in zip(pairs, sims)
+        ]
         
         if not similarities:
             return {"error": "No valid results"}
@@ -305,8 +483,18 @@ class RAGEvaluator:
             List of failed queries with details
         """
         failures = []
+        if not self.results:
+            return failures
+        
+        if self._columns_in_sync():
+            # Only visit the misses, found with one vectorized comparison
+            misses = np.flatnonzero(np.frombuffer(self._hit_flags, dtype=np.int8) == 0)
+            candidates = [self.results[i] for i in misses]
+        else:
+            # results modified from outside: scan them all
+            candidates = self.results
         
-        for result in self.results:
+        for result in candidates:
             if result.get("error"):
                 failures.append({
                     "query": result["query"],
@@ -327,6 +515,9 @@ class RAGEvaluator:
     def clear_results(self):
         """Clear accumulated results."""
         self.results = []
+        self._reciprocal_ranks = array('d')
+        self._precisions = array('d')
+        self._hit_flags = array('b')
     
     def get_summary(self) -> str:
         """
@@ -338,21 +529,27 @@ class RAGEvaluator:
         if not self.results:
             return "No results to summarize"
         
-        valid_results = [r for r in self.results if r.get("error") is None]
-        
-        if not valid_results:
+        if self._columns_in_sync():
+            # Straight from the metric columns, no pass over the result dicts
+            score_matrix = np.column_stack([
+                np.frombuffer(self._reciprocal_ranks, dtype=np.float64),
+                np.frombuffer(self._precisions, dtype=np.float64),
+                np.frombuffer(self._hit_flags, dtype=np.int8),
+            ])
+        else:
+            score_matrix = self._score_matrix(self.results)
+        
+        if not len(score_matrix):
             return "All queries resulted in errors"
         
-        mrr = sum(r["reciprocal_rank"] for r in valid_results) / len(valid_results)
-        avg_precision = sum(r["precision_at_k"] for r in valid_results) / len(valid_results)
-        hit_rate = sum(1 for r in valid_results if r["hit_at_k"]) / len(valid_results)
+        mrr, avg_precision, hit_rate = score_matrix.mean(axis=0)
         
         lines = [
             "=" * 50,
             "RAG RETRIEVAL EVALUATION",
             "=" * 50,
-            f"Total queries: {len(valid_results)}",
-            f"Errors: {len(self.results) - len(valid_results)}",
+            f"Total queries: {len(score_matrix)}",
+            f"Errors: {len(self.results) - len(score_matrix)}",
             f"MRR: {mrr:.4f}",
             f"Avg Precision@K: {avg_precision:.4f}",
             f"Hit Rate: {hit_rate:.2%}",
@@ -400,49 +597,13 @@ class RAGEvaluator:
         if self.embeddings_manager is None:
             return {"error": "EmbeddingsManager not set"}
         
-        # Prepare data for Ragas
-        queries = []
-        contexts_list = []
-        responses = []
-        ground_truths = []
+        valid_cases = [case for case in test_cases if case.get("query")]
+        samples = self._prepare_ragas_samples(valid_cases, k, use_ground_truth)
         
-        for case in test_cases:
-            query = case.get("query", "")
-            if not query:
-                continue
-            
-            # Retrieve contexts
-            search_results = self.embeddings_manager.search(query=query, n_results=k)
-            if isinstance(search_results, str):  # Error
-                continue
-            
-            # Extract context texts
-            contexts = [result.get("text", "") for result in search_results]
-            contexts_list.append(contexts)
-            queries.append(query)
-            
-            # Get or generate response
-            if "response" in case:
-                response = case["response"]
-            elif self.agent:
-                try:
-                    response = self.agent.process(query)
-                    if hasattr(response, 'content'):
-                        response = response.content
-                    response = str(response)
-                except Exception as e:
-                    response = f"Error generating response: {e}"
-            else:
-                # Use first context as a simple response placeholder
-                response = contexts[0] if contexts else ""
-            
-            responses.append(response)
-            
-            # Ground truth (optional)
-            if use_ground_truth and "reference" in case:
-                ground_truths.append(case["reference"])
-            else:
-                ground_truths.append("")  # Empty string if no ground truth
+        queries = [sample[0] for sample in samples]
+        contexts_list = [sample[1] for sample in samples]
+        responses = [sample[2] for sample in samples]
+        ground_truths = [sample[3] for sample in samples]
         
         if not queries:
             return {"error": "No valid queries to evaluate"}
@@ -459,65 +620,8 @@ class RAGEvaluator:
             eval_data["ground_truth"] = ground_truths
         
         try:
-            dataset = Dataset.from_dict(eval_data)
-            
-            # Define metrics to compute
-            metrics_to_compute = [
-                answer_relevancy,
-                faithfulness,
-                context_precision,
-                context_recall,
-            ]
-            
-            # Run evaluation
-            result_dataset = evaluate(
-                dataset=dataset,
-                metrics=metrics_to_compute,
-            )
-            
-            # Ragas returns a Dataset with metric scores as columns
-            # Extract mean values for each metric
-            ragas_metrics = {}
-            
-            # Try different ways to access the metrics
-            if hasattr(result_dataset, 'to_pandas'):
-                df = result_dataset.to_pandas()
-                ragas_metrics["answer_relevancy"] = float(df.get("answer_relevancy", df.get("answer_relevancy_score", [0.0])).mean())
-                ragas_metrics["faithfulness"] = float(df.get("faithfulness", df.get("faithfulness_score", [0.0])).mean())
-                ragas_metrics["context_precision"] = float(df.get("context_precision", df.get("context_precision_score", [0.0])).mean())
-                ragas_metrics["context_recall"] = float(df.get("context_recall", df.get("context_recall_score", [0.0])).mean())
-            elif hasattr(result_dataset, 'to_dict'):
-                result_dict = result_dataset.to_dict()
-                # Extract mean from lists if present
-                for metric_name in ["answer_relevancy", "faithfulness", "context_precision", "context_recall"]:
-                    values = result_dict.get(metric_name, result_dict.get(f"{metric_name}_score", [0.0]))
-                    if isinstance(values, list):
-                        ragas_metrics[metric_name] = float(sum(values) / len(values)) if values else 0.0
-                    else:
-                        ragas_metrics[metric_name] = float(values)
-            else:
-                # Fallback: try to access as attributes
-                ragas_metrics = {
-                    "answer_relevancy": 0.0,
-                    "faithfulness": 0.0,
-                    "context_precision": 0.0,
-                    "context_recall": 0.0,
-                }
-                for metric_name in ragas_metrics.keys():
-                    try:
-                        if hasattr(result_dataset, metric_name):
-                            val = getattr(result_dataset, metric_name)
-                            ragas_metrics[metric_name] = float(val) if not isinstance(val, list) else float(sum(val) / len(val))
-                    except:
-                        pass
-            
-            # Calculate average score
-            ragas_metrics["average_score"] = sum(ragas_metrics.values()) / len(ragas_metrics)
-            ragas_metrics["total_samples"] = len(queries)
-            ragas_metrics["ragas_available"] = True
-            
+            ragas_metrics = self._compute_ragas_metrics(eval_data)
             self.ragas_results.append(ragas_metrics)
-            
             return ragas_metrics
             
         except Exception as e:
@@ -526,6 +630,108 @@ class RAGEvaluator:
                 "ragas_available": True
             }
     
+    def _prepare_ragas_samples(
+        self,
+        cases: List[Dict[str, Any]],
+        k: int,
+        use_ground_truth: bool
+    ) -> List[tuple]:
+        """
+        Prepare the Ragas samples of a batch, in test-case order.
+        
+        With the answer cache on, a query already answered by the same agent and
+        knowledge base reuses its contexts and answer; the others go through
+        retrieval + agent, I/O bound, so they run concurrently.
+        
+        Returns:
+            List of (query, contexts, response, ground_truth), failed retrievals left out
+        """
+        version = self._answer_version(k) if self._answer_cache is not None else None
+        samples = [None] * len(cases)
+        to_prepare = []
+        cache_keys = {}
+        for i, case in enumerate(cases):
+            # Cases carrying their own response cost no LLM call, they bypass the cache
+            if version is None or "response" in case:
+                to_prepare.append(i)
+                continue
+            cache_keys[i] = self._answer_key(version, case["query"])
+            cached = self._answer_cache.get(cache_keys[i])
+            if cached is None:
+                to_prepare.append(i)
+                continue
+            ground_truth = case["reference"] if use_ground_truth and "reference" in case else ""
+            samples[i] = (case["query"], cached["contexts"], cached["answer"], ground_truth)
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as executor:
+            prepared = executor.map(
+                lambda i: self._prepare_ragas_sample(cases[i], k, use_ground_truth), to_prepare
+            )
+            for i, sample in zip(to_prepare, prepared):
+                samples[i] = sample
+                if (sample is not None and i in cache_keys
+                        and not sample[2].startswith("Error generating response")):
+                    self._answer_cache.put(cache_keys[i], {"contexts": sample[1], "answer": sample[2]})
+        
+        return [sample for sample in samples if sample is not None]
+    
+    def _answer_version(self, k: int) -> str:
+        """
+        Version of the cached answers: they depend on the agent (class, model and
+        source, which holds its prompts), the knowledge base file and k.
+        """
+        digest = hashlib.sha256()
+        if self.agent is not None:
+            llm = getattr(self.agent, "llm", None)
+            model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+            digest.update(f"{type(self.agent).__name__}|{model}".encode("utf-8"))
+            digest.update(_file_digest(getattr(sys.modules.get(type(self.agent).__module__), "__file__", None)))
+        digest.update(_file_digest(getattr(self.embeddings_manager, "json_path", None)))
+        return f"{digest.hexdigest()[:16]}|k={k}"
+
+    @staticmethod
+    def _answer_key(version: str, query: str) -> str:
+        """Cache key: the query (case- and whitespace-normalized) under a version."""
+        canonical = f"{version}\x1e{' '.join(query.casefold().split())}"
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def _prepare_ragas_sample(self, case: Dict[str, Any], k: int, use_ground_truth: bool):
+        """
+        Retrieve contexts and get the answer for one test case.
+        
+        Returns:
+            (query, contexts, response, ground_truth), or None if retrieval failed
+        """
+        query = case["query"]
+        
+        # Retrieve contexts
+        search_results = self.embeddings_manager.search(query=query, n_results=k)
+        if isinstance(search_results, str):  # Error
+            return None
+        
+        # Extract context texts
+        contexts = [result.get("text", "") for result in search_results]
+        
+        # Get or generate response
+        if "response" in case:
+            response = case["response"]
+        elif self.agent:
+            try:
+                response = self.agent.process(query)
+                if hasattr(response, 'content'):
+                    response = response.content
+                response = str(response)
+            except Exception as e:
+                response = f"Error generating response: {e}"
+        else:
+            # Use first context as a simple response placeholder
+            response = contexts[0] if contexts else ""
+        
+        # Ground truth (optional), empty string if none
+        ground_truth = case["reference"] if use_ground_truth and "reference" in case else ""
+        
+        return query, contexts, response, ground_truth
+    
     def evaluate_with_ragas_from_responses(
         self,
         queries: List[str],
@@ -565,45 +771,111 @@ class RAGEvaluator:
             eval_data["ground_truth"] = ground_truths
         
         try:
-            dataset = Dataset.from_dict(eval_data)
-            
-            metrics_to_compute = [
-                answer_relevancy,
-                faithfulness,
-                context_precision,
-                context_recall,
-            ]
-            
-            result_dataset = evaluate(
-                dataset=dataset,
-                metrics=metrics_to_compute,
-            )
-            
-            # Extract metrics from result dataset
-            ragas_metrics = {}
-            if hasattr(result_dataset, 'to_pandas'):
-                df = result_dataset.to_pandas()
-                ragas_metrics["answer_relevancy"] = float(df.get("answer_relevancy", df.get("answer_relevancy_score", [0.0])).mean())
-                ragas_metrics["faithfulness"] = float(df.get("faithfulness", df.get("faithfulness_score", [0.0])).mean())
-                ragas_metrics["context_precision"] = float(df.get("context_precision", df.get("context_precision_score", [0.0])).mean())
-                ragas_metrics["context_recall"] = float(df.get("context_recall", df.get("context_recall_score", [0.0])).mean())
-            elif hasattr(result_dataset, 'to_dict'):
-                result_dict = result_dataset.to_dict()
-                for metric_name in ["answer_relevancy", "faithfulness", "context_precision", "context_recall"]:
-                    values = result_dict.get(metric_name, result_dict.get(f"{metric_name}_score", [0.0]))
-                    ragas_metrics[metric_name] = float(sum(values) / len(values)) if isinstance(values, list) and values else float(values) if not isinstance(values, list) else 0.0
-            else:
-                ragas_metrics = {"answer_relevancy": 0.0, "faithfulness": 0.0, "context_precision": 0.0, "context_recall": 0.0}
-            
-            ragas_metrics["average_score"] = sum(ragas_metrics.values()) / len(ragas_metrics)
-            ragas_metrics["total_samples"] = len(queries)
-            ragas_metrics["ragas_available"] = True
-            
-            return ragas_metrics
+            return self._compute_ragas_metrics(eval_data)
             
         except Exception as e:
             return {
                 "error": f"Ragas evaluation failed: {str(e)}",
                 "ragas_available": True
             }
-
+    
+    def _compute_ragas_metrics(self, eval_data: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """
+        Score samples with Ragas (cached samples skip the LLM judge) and average them.
+        
+        Args:
+            eval_data: Ragas columns ('question', 'contexts', 'answer', optional 'ground_truth')
+            
+        Returns:
+            Dictionary with the mean of each Ragas metric
+        """
+        rows = self._score_samples(eval_data)
+        
+        # Mean over the samples the judge could score (NaN = judge failure)
+        ragas_metrics = {}
+        for metric_name in RAGAS_METRIC_NAMES:
+            values = [row[metric_name] for row in rows if not math.isnan(row[metric_name])]
+            ragas_metrics[metric_name] = sum(values) / len(values) if values else 0.0
+        
+        ragas_metrics["average_score"] = sum(ragas_metrics.values()) / len(ragas_metrics)
+        ragas_metrics["total_samples"] = len(rows)
+        ragas_metrics["ragas_available"] = True
+        ragas_metrics["cache_hits"] = self._ragas_cache.hits
+        ragas_metrics["cache_misses"] = self._ragas_cache.misses
+        
+        return ragas_metrics
+    
+    def _score_samples(self, eval_data: Dict[str, List[Any]]) -> List[Dict[str, float]]:
+        """
+        Per-sample Ragas scores. The judge only sees samples that are neither cached
+        nor duplicates of another sample of the batch, in a single evaluate() call.
+        
+        Samples retrieved with the same contexts are sent next to each other, so
+        consecutive judge prompts share their longest prefix and the LLM server's
+        prefix (KV) cache serves it instead of recomputing it.
+        """
+        questions = eval_data["question"]
+        ground_truths = eval_data.get("ground_truth") or [""] * len(questions)
+        judge = self._judge_identity()
+        keys = [
+            self._ragas_cache.key(q, c, a, g, judge)
+            for q, c, a, g in zip(questions, eval_data["contexts"], eval_data["answer"], ground_truths)
+        ]
+        rows = [self._ragas_cache.get(key) for key in keys]
+        
+        # Identical samples within the batch are judged once (first occurrence)
+        to_judge = {}
+        for i, row in enumerate(rows):
+            if row is None:
+                to_judge.setdefault(keys[i], i)
+        if to_judge:
+            # Grouped by context set (stable: test-case order within a group)
+            judged = sorted(to_judge.values(), key=lambda i: "\x1f".join(eval_data["contexts"][i]))
+            subset = {column: [values[i] for i in judged] for column, values in eval_data.items()}
+            result_dataset = evaluate(
+                dataset=Dataset.from_dict(subset),
+                metrics=[answer_relevancy, faithfulness, context_precision, context_recall],
+                llm=self.ragas_llm,
+                embeddings=self.ragas_embeddings,
+            )
+            scores_by_key = dict(zip(
+                (keys[i] for i in judged), self._per_sample_scores(result_dataset, len(judged))
+            ))
+            for key, scores in scores_by_key.items():
+                # Judge failures (NaN) are retried on the next run
+                if not any(math.isnan(v) for v in scores.values()):
+                    self._ragas_cache.put(key, scores)
+            rows = [row if row is not None else scores_by_key[key] for row, key in zip(rows, keys)]
+        
+        return rows
+    
+    def _judge_identity(self) -> str:
+        """Judge LLM and embedding models, so scores of another judge are never reused."""
+        return f"llm={_model_identity(self.ragas_llm)}|embeddings={_model_identity(self.ragas_embeddings)}"
+    
+    @staticmethod
+    def _per_sample_scores(result_dataset, n: int) -> List[Dict[str, float]]:
+        """Extract one {metric: score} dict per sample from a Ragas result."""
+        columns = {}
+        if hasattr(result_dataset, 'to_pandas'):
+            df = result_dataset.to_pandas()
+            for metric_name in RAGAS_METRIC_NAMES:
+                column = metric_name if metric_name in df else f"{metric_name}_score"
+                columns[metric_name] = df[column].tolist() if column in df else [0.0] * n
+        elif hasattr(result_dataset, 'to_dict'):
+            result_dict = result_dataset.to_dict()
+            for metric_name in RAGAS_METRIC_NAMES:
+                values = result_dict.get(metric_name, result_dict.get(f"{metric_name}_score", 0.0))
+                columns[metric_name] = values if isinstance(values, list) else [values] * n
+        else:
+            for metric_name in RAGAS_METRIC_NAMES:
+                value = getattr(result_dataset, metric_name, 0.0)
+                columns[metric_name] = value if isinstance(value, list) else [value] * n
+        
+        return [
+            {
+                metric_name: math.nan if columns[metric_name][i] is None else float(columns[metric_name][i])
+                for metric_name in RAGAS_METRIC_NAMES
+            }
+            for i in range(n)
+        ]
@@ -4,6 +4,7 @@ Example usage of the evaluation framework.
 This script demonstrates how to run evaluations on the Voice Assistant system.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -12,23 +13,45 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.append(str(project_root / "src"))  # Also add src for module imports
 
-from run_computer import VoiceAssistant
-from core.orchestrator import Orchestrator
-from rag.rag import EmbeddingsManager
-from evaluation.runner import EvaluationRunner
-from evaluation.report import ReportGenerator
+# The assistant, agents and RAG (torch, chromadb, langchain) are imported in main(),
+# after argument parsing: --help, --list and --dry-run start instantly.
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Voice Assistant evaluation suite.")
+    parser.add_argument("--offline", action="store_true", help="Use Ollama instead of OpenAI")
+    parser.add_argument("--list", action="store_true", help="List the available datasets and exit")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the configuration and exit without loading any model")
+    return parser.parse_args()
 
 
 def main():
     """Example evaluation run."""
+    args = parse_args()
+    
+    if args.list:
+        from evaluation.datasets import list_datasets
+        print("\n".join(sorted(list_datasets())))
+        return
     
     # Configuration
-    is_offline = False  # Set to True to use Ollama instead of OpenAI
+    is_offline = args.offline  # Ollama instead of OpenAI
     UsePhone = False
     use_custom_xtts = False
     
+    if args.dry_run:
+        print(f"Would run the full evaluation (offline={is_offline}, phone={UsePhone}, xtts={use_custom_xtts})")
+        return
+    
     print("Initializing Voice Assistant components...")
     
+    from run_computer import VoiceAssistant
+    from core.orchestrator import Orchestrator
+    from rag.rag import EmbeddingsManager
+    from evaluation.runner import EvaluationRunner
+    from evaluation.report import ReportGenerator
+    
     # Initialize components
     try:
         # Initialize orchestrator (for intent classification and agents)
@@ -3,10 +3,15 @@ Metrics computation utilities for evaluation framework.
 Provides reusable functions for classification, retrieval, and task metrics.
 """
 
+import math
+import statistics
 from typing import List, Dict, Any, Optional, Tuple
 from collections import Counter
 import numpy as np
 
+# Below this many values, NumPy's array construction costs more than it saves
+_NUMPY_MIN_SIZE = 64
+
 
 def compute_classification_metrics(
     y_true: List[str],
@@ -34,41 +39,53 @@ def compute_classification_metrics(
     if labels is None:
         labels = sorted(list(set(y_true) | set(y_pred)))
     
-    # Accuracy
-    correct = sum(1 for t, p in zip(y_true, y_pred) if t == p)
+    # Labels as ints; anything outside `labels` goes to an extra last index C,
+    # so it still counts as a false positive/negative of the labels it meets
+    C = len(labels)
+    label_to_idx = {label: i for i, label in enumerate(labels)}
+    yt = np.fromiter((label_to_idx.get(t, C) for t in y_true), dtype=np.int64, count=len(y_true))
+    yp = np.fromiter((label_to_idx.get(p, C) for p in y_pred), dtype=np.int64, count=len(y_pred))
+    
+    # Confusion matrix in one histogram pass over flattened (true, predicted) cells,
+    # rows = true, columns = predicted
+    width = C + 1
+    cm = np.bincount(yt * width + yp, minlength=width * width).reshape(width, width)
+    tp = np.diag(cm)[:C]
+    
+    # Accuracy (pairs of unknown labels are compared on the raw strings)
+    both_unknown = np.nonzero((yt == C) & (yp == C))[0]
+    correct = int(tp.sum()) + sum(1 for i in both_unknown if y_true[i] == y_pred[i])
     accuracy = correct / len(y_true)
     
-    # Per-class metrics
-    per_class = {}
-    for label in labels:
-        tp = sum(1 for t, p in zip(y_true, y_pred) if t == label and p == label)
-        fp = sum(1 for t, p in zip(y_true, y_pred) if t != label and p == label)
-        fn = sum(1 for t, p in zip(y_true, y_pred) if t == label and p != label)
-        
-        precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
-        recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
-        f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
-        support = sum(1 for t in y_true if t == label)
-        
-        per_class[label] = {
-            "precision": precision,
-            "recall": recall,
-            "f1": f1,
-            "support": support
+    # Per-class metrics, all classes at once
+    fp = cm[:, :C].sum(axis=0) - tp
+    fn = cm[:C, :].sum(axis=1) - tp
+    support = cm[:C, :].sum(axis=1)
+    
+    precision = np.divide(tp, tp + fp, out=np.zeros(C), where=(tp + fp) > 0)
+    recall = np.divide(tp, tp + fn, out=np.zeros(C), where=(tp + fn) > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(C), where=(precision + recall) > 0)
+    
+    per_class = {
+        label: {
+            "precision": float(precision[i]),
+            "recall": float(recall[i]),
+            "f1": float(f1[i]),
+            "support": int(support[i])
         }
+        for i, label in enumerate(labels)
+    }
     
     # Macro averages
-    macro_precision = np.mean([m["precision"] for m in per_class.values()])
-    macro_recall = np.mean([m["recall"] for m in per_class.values()])
-    macro_f1 = np.mean([m["f1"] for m in per_class.values()])
-    
-    # Confusion matrix
-    confusion_matrix = {}
-    for true_label in labels:
-        confusion_matrix[true_label] = {}
-        for pred_label in labels:
-            count = sum(1 for t, p in zip(y_true, y_pred) if t == true_label and p == pred_label)
-            confusion_matrix[true_label][pred_label] = count
+    macro_precision = float(precision.mean()) if C else 0.0
+    macro_recall = float(recall.mean()) if C else 0.0
+    macro_f1 = float(f1.mean()) if C else 0.0
+    
+    # Confusion matrix as nested dicts (known labels only)
+    confusion_matrix = {
+        true_label: {pred_label: int(cm[i, j]) for j, pred_label in enumerate(labels)}
+        for i, true_label in enumerate(labels)
+    }
     
     return {
         "accuracy": accuracy,
@@ -105,42 +122,32 @@ def compute_retrieval_metrics(
     if len(queries) == 0:
         return {"error": "Empty input"}
     
-    # Mean Reciprocal Rank
-    reciprocal_ranks = []
-    for retrieved, relevant in zip(retrieved_docs, relevant_docs):
+    # Hit matrix: H[q, i] is True when the i-th retrieved doc of query q is relevant
+    # (one membership test per retrieved doc, every metric is derived from it)
+    width = max([len(retrieved) for retrieved in retrieved_docs] + list(k_values) + [1])
+    H = np.zeros((len(queries), width), dtype=np.bool_)
+    rel_sizes = np.empty(len(queries), dtype=np.float64)
+    for q, (retrieved, relevant) in enumerate(zip(retrieved_docs, relevant_docs)):
         relevant_set = set(relevant)
-        rr = 0.0
-        for i, doc_id in enumerate(retrieved):
-            if doc_id in relevant_set:
-                rr = 1.0 / (i + 1)
-                break
-        reciprocal_ranks.append(rr)
+        rel_sizes[q] = len(relevant_set)
+        H[q, :len(retrieved)] = [doc_id in relevant_set for doc_id in retrieved]
     
-    mrr = np.mean(reciprocal_ranks)
+    # Mean Reciprocal Rank (rank of the first hit, 0 if none)
+    first_hit = H.argmax(axis=1)
+    reciprocal_ranks = np.where(H.any(axis=1), 1.0 / (first_hit + 1), 0.0)
+    mrr = float(reciprocal_ranks.mean())
     
-    # Precision@K and Recall@K
+    # Precision@K and Recall@K from the cumulative hit counts
+    cumhits = H.cumsum(axis=1)
     precision_at_k = {}
     recall_at_k = {}
     
     for k in k_values:
-        precisions = []
-        recalls = []
-        
-        for retrieved, relevant in zip(retrieved_docs, relevant_docs):
-            relevant_set = set(relevant)
-            retrieved_at_k = retrieved[:k]
-            
-            # Relevant docs in top-k
-            relevant_in_k = sum(1 for doc in retrieved_at_k if doc in relevant_set)
-            
-            precision = relevant_in_k / k if k > 0 else 0.0
-            recall = relevant_in_k / len(relevant_set) if len(relevant_set) > 0 else 0.0
-            
-            precisions.append(precision)
-            recalls.append(recall)
-        
-        precision_at_k[k] = np.mean(precisions)
-        recall_at_k[k] = np.mean(recalls)
+        relevant_in_k = cumhits[:, k - 1] if k > 0 else np.zeros(len(queries))
+        precision_at_k[k] = float((relevant_in_k / k).mean()) if k > 0 else 0.0
+        recall_at_k[k] = float(
+            np.divide(relevant_in_k, rel_sizes, out=np.zeros(len(queries)), where=rel_sizes > 0).mean()
+        )
     
     return {
         "mrr": mrr,
@@ -171,7 +178,7 @@ def compute_task_completion_rate(
     
     # Average turns to completion (for successful tasks)
     successful_turns = [r.get("turns", 0) for r in results if r.get("success", False)]
-    avg_turns = np.mean(successful_turns) if successful_turns else 0.0
+    avg_turns = statistics.fmean(successful_turns) if successful_turns else 0.0
     
     # Error recovery rate
     tasks_with_errors = [r for r in results if r.get("had_error", False)]
@@ -249,6 +256,59 @@ def compute_semantic_similarity(
     return dot_product / (norm1 * norm2)
 
 
+def compute_semantic_similarity_batch(
+    texts_a: List[str],
+    texts_b: List[str],
+    embedding_function: Optional[callable] = None,
+    batch_size: int = 64
+) -> np.ndarray:
+    """
+    Compute semantic similarity for many (text_a, text_b) pairs at once.
+    
+    Each distinct text is embedded once, batch_size texts per embedding call,
+    instead of two single-text calls per pair.
+    
+    Args:
+        texts_a: First texts
+        texts_b: Second texts (same length as texts_a)
+        embedding_function: Function mapping a list of texts to an (n, D) array of embeddings
+        batch_size: Number of texts per embedding_function call
+        
+    Returns:
+        Array of cosine similarities (Jaccard word overlap without embedding_function)
+    """
+    if len(texts_a) != len(texts_b):
+        raise ValueError("texts_a and texts_b must have the same length")
+    
+    unique_texts = list(dict.fromkeys(list(texts_a) + list(texts_b)))
+    index = {text: i for i, text in enumerate(unique_texts)}
+    ia = np.fromiter((index[t] for t in texts_a), dtype=np.intp, count=len(texts_a))
+    ib = np.fromiter((index[t] for t in texts_b), dtype=np.intp, count=len(texts_b))
+    
+    if embedding_function is None:
+        # Fallback to simple word overlap (Jaccard similarity), one split per distinct text
+        word_sets = [set(text.lower().split()) for text in unique_texts]
+        return np.array([
+            len(word_sets[a] & word_sets[b]) / len(word_sets[a] | word_sets[b])
+            if word_sets[a] and word_sets[b] else 0.0
+            for a, b in zip(ia, ib)
+        ], dtype=np.float64)
+    
+    if not unique_texts:
+        return np.zeros(0, dtype=np.float64)
+    
+    embeddings = np.concatenate([
+        np.asarray(embedding_function(unique_texts[start:start + batch_size]), dtype=np.float64)
+        for start in range(0, len(unique_texts), batch_size)
+    ])
+    norms = np.linalg.norm(embeddings, axis=1)
+    
+    # Cosine similarity of every pair (0 when an embedding is null)
+    dots = np.einsum("ij,ij->i", embeddings[ia], embeddings[ib])
+    denominators = norms[ia] * norms[ib]
+    return np.divide(dots, denominators, out=np.zeros(len(dots)), where=denominators > 0)
+
+
 def aggregate_scores(
     scores: List[float],
     weights: Optional[List[float]] = None
@@ -266,20 +326,110 @@ def aggregate_scores(
     if len(scores) == 0:
         return {"error": "Empty input"}
     
-    scores_array = np.array(scores)
+    use_numpy = isinstance(scores, np.ndarray) or len(scores) >= _NUMPY_MIN_SIZE
+    
+    # Sorted once: min, max and median are then plain indexing
+    if use_numpy:
+        scores_array = np.asarray(scores, dtype=np.float64)  # no copy for a float64 array
+        sorted_scores = np.sort(scores_array)
+        mean = float(sorted_scores.mean())
+        std = float(sorted_scores.std())
+    else:
+        # Small input: plain Python is faster than building an ndarray
+        sorted_scores = sorted(map(float, scores))
+        mean = statistics.fmean(sorted_scores)
+        std = statistics.pstdev(sorted_scores, mu=mean)
+    
+    n = len(sorted_scores)
+    middle = n // 2
+    median = sorted_scores[middle] if n % 2 else 0.5 * (sorted_scores[middle - 1] + sorted_scores[middle])
     
     result = {
-        "mean": float(np.mean(scores_array)),
-        "std": float(np.std(scores_array)),
-        "min": float(np.min(scores_array)),
-        "max": float(np.max(scores_array)),
-        "median": float(np.median(scores_array)),
+        "mean": mean,
+        "std": std,
+        "min": float(sorted_scores[0]),
+        "max": float(sorted_scores[-1]),
+        "median": float(median),
         "count": len(scores)
     }
     
     if weights is not None and len(weights) == len(scores):
-        weights_array = np.array(weights)
-        result["weighted_mean"] = float(np.average(scores_array, weights=weights_array))
+        if use_numpy:
+            weights_array = np.asarray(weights, dtype=np.float64)
+            result["weighted_mean"] = float(np.average(scores_array, weights=weights_array))
+        else:
+            result["weighted_mean"] = math.fsum(w * x for w, x in zip(weights, scores)) / math.fsum(weights)
     
     return result
 
+
+def aggregate_scores_many(rows) -> Dict[str, np.ndarray]:
+    """
+    aggregate_scores for many score series at once (e.g. one row per criterion).
+    
+    Args:
+        rows: (n_series, n_scores) array-like, one series per row
+        
+    Returns:
+        Dictionary with mean, std, min, max, median arrays (one value per row) and count
+    """
+    rows_array = np.asarray(rows, dtype=np.float64)
+    if rows_array.ndim != 2 or rows_array.shape[1] == 0:
+        return {"error": "Expected a non-empty (n_series, n_scores) array"}
+    
+    sorted_rows = np.sort(rows_array, axis=1)
+    n = sorted_rows.shape[1]
+    middle = n // 2
+    median = sorted_rows[:, middle] if n % 2 else 0.5 * (sorted_rows[:, middle - 1] + sorted_rows[:, middle])
+    
+    return {
+        "mean": sorted_rows.mean(axis=1),
+        "std": sorted_rows.std(axis=1),
+        "min": sorted_rows[:, 0],
+        "max": sorted_rows[:, -1],
+        "median": median,
+        "count": n
+    }
+
+
+class StreamingStats:
+    """
+    Running mean/std/min/max of a stream of scores (Welford's algorithm).
+    
+    O(1) memory and O(1) per score: metrics can be refreshed after every new
+    result without re-aggregating all the previous ones. No median (it needs
+    every score, see aggregate_scores).
+    """
+    
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+    
+    def push(self, x: float):
+        """Add one score."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Current statistics, same keys as aggregate_scores (population std, no median).
+        """
+        if self.n == 0:
+            return {"error": "Empty input"}
+        
+        return {
+            "mean": self.mean,
+            "std": (self.m2 / self.n) ** 0.5,
+            "min": self.min,
+            "max": self.max,
+            "count": self.n
+        }
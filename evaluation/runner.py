@@ -4,7 +4,9 @@ Orchestrates all evaluators and produces unified evaluation reports.
 """
 
 import sys
-import json
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -16,6 +18,12 @@ from evaluation.evaluators.intent_evaluator import IntentEvaluator
 from evaluation.evaluators.agent_evaluator import AgentEvaluator
 from evaluation.evaluators.rag_evaluator import RAGEvaluator
 from evaluation.evaluators.e2e_evaluator import EndToEndEvaluator
+from evaluation.datasets import load_dataset, load_test_cases
+
+# Read-only evaluation stages run at the same time (each one is dominated by LLM
+# round-trips); EVAL_MAX_CONCURRENT_STAGES=1 runs them one after the other.
+# Stages that write to the database (agents, e2e) never overlap each other.
+MAX_CONCURRENT_STAGES = int(os.getenv("EVAL_MAX_CONCURRENT_STAGES", "4"))
 
 
 class EvaluationRunner:
@@ -60,13 +68,8 @@ class EvaluationRunner:
         self.results = {}
     
     def _load_test_dataset(self, dataset_path: str) -> Dict[str, Any]:
-        """Load a test dataset from JSON file."""
-        dataset_file = Path(__file__).parent / "datasets" / dataset_path
-        if not dataset_file.exists():
-            raise FileNotFoundError(f"Dataset not found: {dataset_file}")
-        
-        with open(dataset_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load a test dataset from JSON file (parsed once per process, shared: do not mutate)."""
+        return load_dataset(Path(dataset_path).stem)
     
     def evaluate_intent_classification(self) -> Dict[str, Any]:
         """
@@ -106,6 +109,7 @@ class EvaluationRunner:
         
         print("Evaluating agents...")
         agent_results = {}
+        general_job = None
         
         # Get agents from orchestrator if not provided
         if agents is None:
@@ -115,48 +119,49 @@ class EvaluationRunner:
                 "order": getattr(self.orchestrator, "order_agent", None)
             }
         
-        # Evaluate reservation agent
-        if agents.get("reservation"):
-            print("  - Reservation agent...")
-            reservation_dataset = self._load_test_dataset("reservation_scenarios.json")
-            reservation_results = self.agent_evaluator.evaluate_reservation_agent(
-                agents["reservation"],
-                reservation_dataset.get("test_cases", [])  # Use test_cases, not scenarios
-            )
-            agent_results["reservation"] = reservation_results
-        
-        # Evaluate general agent (handles both general inquiries and menu queries)
-        if agents.get("general"):
-            print("  - General agent (general + menu queries)...")
-            # Load both general and menu test cases
-            general_dataset = self._load_test_dataset("general_queries.json")
-            menu_dataset = self._load_test_dataset("menu_queries.json")
-
-            # Merge test cases from both datasets
-            combined_test_cases = (
-                general_dataset.get("test_cases", [])[:10] +
-                menu_dataset.get("test_cases", [])[:10]
-            )
+        # Only the general agent is read-only (RAG): it runs in the background while
+        # the reservation and order agents, which write to the database, run one
+        # after the other in this thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Evaluate general agent (handles both general inquiries and menu queries)
+            if agents.get("general"):
+                print("  - General agent (general + menu queries)...")
+                # Merge the first test cases of the general and menu datasets
+                combined_test_cases = (
+                    load_test_cases("general_queries", limit=10) +
+                    load_test_cases("menu_queries", limit=10)
+                )
 
-            general_results = self.agent_evaluator.evaluate_general_agent(
-                agents["general"],
-                combined_test_cases
-            )
-            agent_results["general"] = general_results
-        
-        # Evaluate order agent
-        if agents.get("order"):
-            print("  - Order agent...")
-            # Use simple test cases for order agent
-            order_test_cases = [
-                {"input": "I'd like to order a pizza", "expected_items": ["pizza"], "expected_action": "place_order"},
-                {"input": "Add a burger to my order", "expected_items": ["burger"], "expected_action": "modify_order"}
-            ]
-            order_results = self.agent_evaluator.evaluate_order_agent(
-                agents["order"],
-                order_test_cases
-            )
-            agent_results["order"] = order_results
+                general_job = executor.submit(
+                    self.agent_evaluator.evaluate_general_agent,
+                    agents["general"],
+                    combined_test_cases
+                )
+            
+            # Evaluate reservation agent
+            if agents.get("reservation"):
+                print("  - Reservation agent...")
+                reservation_dataset = self._load_test_dataset("reservation_scenarios.json")
+                agent_results["reservation"] = self.agent_evaluator.evaluate_reservation_agent(
+                    agents["reservation"],
+                    reservation_dataset.get("test_cases", [])  # Use test_cases, not scenarios
+                )
+            
+            # Evaluate order agent
+            if agents.get("order"):
+                print("  - Order agent...")
+                # Use simple test cases for order agent
+                order_test_cases = [
+                    {"input": "I'd like to order a pizza", "expected_items": ["pizza"], "expected_action": "place_order"},
+                    {"input": "Add a burger to my order", "expected_items": ["burger"], "expected_action": "modify_order"}
+                ]
+                agent_results["order"] = self.agent_evaluator.evaluate_order_agent(
+                    agents["order"],
+                    order_test_cases
+                )
+            
+            if general_job is not None:
+                agent_results["general"] = general_job.result()
         
         self.results["agents"] = agent_results
         return agent_results
@@ -237,6 +242,37 @@ class EvaluationRunner:
         """
         Run a complete evaluation suite.
 
+        Stages run concurrently (see run_full_evaluation_async); from code that
+        already runs an event loop, await run_full_evaluation_async instead.
+
+        Args:
+            include_agents: Whether to evaluate individual agents
+            include_rag: Whether to evaluate RAG retrieval
+            include_e2e: Whether to evaluate end-to-end tasks
+
+        Returns:
+            Complete evaluation results
+        """
+        return asyncio.run(self.run_full_evaluation_async(
+            include_agents=include_agents,
+            include_rag=include_rag,
+            include_e2e=include_e2e
+        ))
+
+    async def run_full_evaluation_async(
+        self,
+        include_agents: bool = True,
+        include_rag: bool = True,
+        include_e2e: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run a complete evaluation suite, the stages gathered concurrently.
+
+        Each stage runs in a worker thread (the evaluators are blocking), at most
+        MAX_CONCURRENT_STAGES at a time. Intent and RAG only read, so they overlap
+        with everything; agents and e2e create and cancel reservations and orders,
+        so they run one after the other to keep the reports reproducible.
+
         Args:
             include_agents: Whether to evaluate individual agents
             include_rag: Whether to evaluate RAG retrieval
@@ -257,40 +293,46 @@ class EvaluationRunner:
             }
         }
         
-        # Intent classification (always run)
-        try:
-            intent_metrics = self.evaluate_intent_classification()
-            self.results["configuration"]["evaluations_run"].append("intent")
-        except Exception as e:
-            intent_metrics = {"error": str(e)}
-        self.results["intent_classification"] = intent_metrics
-        
-        # Agent evaluation
+        # (name in evaluations_run, results key, stage, writes to the DB);
+        # intent classification always runs
+        stages = [("intent", "intent_classification", self.evaluate_intent_classification, False)]
         if include_agents:
-            try:
-                agent_metrics = self.evaluate_agents()
-                self.results["configuration"]["evaluations_run"].append("agents")
-            except Exception as e:
-                agent_metrics = {"error": str(e)}
-            self.results["agents"] = agent_metrics
-        
-        # RAG evaluation
+            stages.append(("agents", "agents", self.evaluate_agents, True))
         if include_rag:
-            try:
-                rag_metrics = self.evaluate_rag_retrieval(use_ragas=True)
-                self.results["configuration"]["evaluations_run"].append("rag")
-            except Exception as e:
-                rag_metrics = {"error": str(e)}
-            self.results["rag"] = rag_metrics
-        
-        # E2E evaluation
+            stages.append(("rag", "rag", lambda: self.evaluate_rag_retrieval(use_ragas=True), False))
         if include_e2e:
-            try:
-                e2e_metrics = self.evaluate_end_to_end()
-                self.results["configuration"]["evaluations_run"].append("e2e")
-            except Exception as e:
-                e2e_metrics = {"error": str(e)}
-            self.results["end_to_end"] = e2e_metrics
+            stages.append(("e2e", "end_to_end", self.evaluate_end_to_end, True))
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_STAGES)
+        # Taken before the semaphore, so a waiting stage does not hold a slot
+        # (asyncio.Lock is FIFO: agents runs before e2e)
+        db_lock = asyncio.Lock()
+        
+        async def run_limited(stage):
+            async with semaphore:
+                return await asyncio.to_thread(stage)
+        
+        async def run_stage(stage, writes_db):
+            if not writes_db:
+                return await run_limited(stage)
+            async with db_lock:
+                return await run_limited(stage)
+        
+        outcomes = await asyncio.gather(
+            *(run_stage(stage, writes_db) for _, _, stage, writes_db in stages),
+            return_exceptions=True
+        )
+        
+        # Record in stage order, whatever order they finished in
+        for (name, key, _, _), outcome in zip(stages, outcomes):
+            if isinstance(outcome, Exception):
+                outcome = {"error": str(outcome)}
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                self.results["configuration"]["evaluations_run"].append(name)
+            self.results.pop(key, None)  # the stage stored it on completion, re-insert in stage order
+            self.results[key] = outcome
 
         print("\n" + "=" * 70)
         print("EVALUATION COMPLETE")
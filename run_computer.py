@@ -1,6 +1,7 @@
 import sys
 import time
 import os
+import asyncio
 from pathlib import Path
 from typing import List, Dict
 
@@ -22,6 +23,8 @@ class VoiceAssistant:
         self.language_processor = LanguageProcessor()
         self.orchestrator = Orchestrator(isOffline=isOffline)
         self.current_language = 'en'
+        # One event loop for every turn: the shared async HTTP clients bind to the loop they first ran on
+        self._loop = asyncio.new_event_loop()
 
         audio_dir = 'static/audioAutomatic'
         generated_dir = 'static/audioGenerated'
@@ -41,10 +44,19 @@ class VoiceAssistant:
         print(f"[You said] {audio_text}")
         return audio_text
     
-    def process(self, user_input: str) -> str:
-        """Process the complete pipeline: translate -> orchestrate -> translate back."""
-        # 1. Detect language and translate to English
-        english_input, original_lang = self.language_processor.process_input(user_input)
+    def process(self, user_input: str, speak: bool = False) -> str:
+        """
+        Process the complete pipeline: translate -> orchestrate -> translate back.
+
+        Args:
+            user_input: The user's utterance
+            speak: Also speak the answer, sentence by sentence while the agent is still
+                   generating it (run() only; evaluations call process() silently)
+        """
+        # 1. Detect language and translate to English (online, the request is routed in parallel)
+        english_input, original_lang, intent, direct_answer = self.orchestrator.translate_and_classify(
+            user_input, self.language_processor, self.conversation_history
+        )
         print(f"[Language] Detected: {original_lang} | Translated: {english_input}")
 
         # Check for exit commands
@@ -54,10 +66,10 @@ class VoiceAssistant:
             self.speak(reponse)
             return False
         
-        # 2. Process through orchestrator (intent classification + agent routing + conversation history)
-        english_response = self.orchestrator.process_request(
-            english_input,
-            conversation_history=self.conversation_history
+        # 2. Stream through orchestrator (intent classification + agent routing + conversation history),
+        # each sentence translated back (and spoken) as soon as it is complete
+        english_response, final_response = self._loop.run_until_complete(
+            self._stream_and_speak(english_input, original_lang, intent, direct_answer, speak)
         )
 
         # 3. Add to conversation history
@@ -70,11 +82,45 @@ class VoiceAssistant:
             "content": english_response
         })
         
-        # 4. Translate response back to original language
-        final_response = self.language_processor.process_output(english_response, original_lang)
-        print(f"[Assistant] {final_response}")
-        
         return final_response, original_lang
+
+    async def _stream_and_speak(self, english_input: str, original_lang: str,
+                                intent: str = None, direct_answer: str = None, speak: bool = True):
+        """
+        Translate (and, if speak, play) each streamed sentence; sentence N plays in a
+        worker thread while sentence N+1 is generated and translated.
+
+        Returns:
+            (english answer, translated answer)
+        """
+        if direct_answer:
+            # A greeting or small talk was already answered while routing
+            sentences = self._single_answer(direct_answer)
+        else:
+            sentences = self.orchestrator.astream_request(
+                english_input, self.conversation_history, precomputed_intent=intent
+            )
+
+        english_sentences, spoken_sentences = [], []
+        speaking = None
+        async for sentence in sentences:
+            english_sentences.append(sentence)
+            reply = await asyncio.to_thread(self.language_processor.process_output, sentence, original_lang)
+            print(f"[Assistant] {reply}")
+            spoken_sentences.append(reply)
+            if not speak:
+                continue
+            if speaking is not None:
+                await speaking
+            speaking = asyncio.create_task(asyncio.to_thread(self.speak, reply, original_lang))
+        if speaking is not None:
+            await speaking
+
+        return " ".join(english_sentences), " ".join(spoken_sentences)
+
+    @staticmethod
+    async def _single_answer(answer: str):
+        yield answer
     
     def speak(self, text: str, language: str = None):
         """Convert text to speech."""
@@ -98,16 +144,11 @@ class VoiceAssistant:
                     print("[Error] Could not understand audio")
                     continue
 
-                # Step 2-3-4: Process (translate -> orchestrate -> translate back)
-                result = self.process(user_input)
+                # Step 2-3-4-5: Process (translate -> orchestrate -> translate back -> speak)
+                result = self.process(user_input, speak=True)
 
                 # Exit if user requested to leave
                 if not result : break
-
-                response, language = result
-                
-                # Step 5: Speak the response
-                self.speak(response, language=language)
                 
                 print("\n" + "-"*60 + "\n")
                 
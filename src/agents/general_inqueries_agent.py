@@ -1,8 +1,10 @@
 import os
 from langchain_ollama import OllamaLLM
-from langchain.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
+from core.http_client import get_http_client, get_async_http_client
 from langchain.agents import create_react_agent, Tool, AgentExecutor
 from langchain_core.prompts import PromptTemplate
+from .streaming import astream_final_answer
 from .tools.general_inquiry_tools import (
     search_general_info_tool,
     search_faqs_tool,
@@ -18,15 +20,20 @@ from .tools.general_inquiry_tools import (
 class GeneralInqueriesAgent:
     """Agent for handling general inquiries about the restaurant using RAG."""
 
-    def __init__(self, isOffline=True):
+    def __init__(self, isOffline=True, model="llama3"):
         """Initialize the agent with LLM and RAG tools."""
         if isOffline:
-            self.llm = OllamaLLM(model="llama3", temperature=0)
+            # Keep the model loaded between calls: Ollama then reuses the KV cache of the
+            # prompt prefix shared by every call (ReAct instructions + tool descriptions)
+            self.llm = OllamaLLM(model=model, temperature=0,
+                                 keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "30m"))
         else:
             api_key = os.getenv("API_KEY_OPENAI")
             if not api_key:
                 raise ValueError("API_KEY_OPENAI not found in environment variables")
-            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key)
+            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key,
+                                  http_client=get_http_client(),
+                                  http_async_client=get_async_http_client())
 
         self.tools = self._create_tools()
         self.agent = self._create_agent()
@@ -207,6 +214,10 @@ Question: {input}
         except Exception as e:
             return f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question."
 
+    def astream_process(self, user_input: str):
+        """Stream the final answer of a general inquiry as it is generated."""
+        return astream_final_answer(self.agent, {"input": user_input})
+
 
 # Fonction wrapper pour l'orchestrateur
 def general_inqueries_agent(user_input: str, isOffline=True) -> str:
@@ -1,9 +1,11 @@
 import os
 from datetime import datetime
 from langchain_ollama import OllamaLLM
-from langchain.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
+from core.http_client import get_http_client, get_async_http_client
 from langchain.agents import create_react_agent, Tool, AgentExecutor
 from langchain_core.prompts import PromptTemplate
+from .streaming import astream_final_answer
 from .tools.order_tools import (
     create_order_tool,
     add_item_tool,
@@ -18,14 +20,16 @@ from .tools.general_inquiry_tools import search_menu_items_tool
 
 
 class OrderHandlingAgent:
-    def __init__(self, isOffline=True):
+    def __init__(self, isOffline=True, model="llama3"):
         if isOffline:
-            self.llm = OllamaLLM(model="llama3", temperature=0)
+            self.llm = OllamaLLM(model=model, temperature=0)
         else:
             api_key = os.getenv("API_KEY_OPENAI")
             if not api_key:
                 raise ValueError("API_KEY_OPENAI not found in environment variables")
-            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key)
+            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key,
+                                  http_client=get_http_client(),
+                                  http_async_client=get_async_http_client())
         
         self.tools = self._create_tools()
         self.agent = self._create_agent()
@@ -328,6 +332,10 @@ Question: {input}
         except Exception as e:
             return f"I apologize, but I encountered an error: {str(e)}. Could you please rephrase your request?"
 
+    def astream_process(self, user_input: str):
+        """Stream the final answer of an order request as it is generated."""
+        return astream_final_answer(self.agent, {"input": user_input})
+
 
 # Fonction wrapper pour l'orchestrateur
 def order_handling_agent(user_input: str) -> str:
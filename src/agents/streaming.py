@@ -0,0 +1,45 @@
+"""
+Streaming helper shared by the ReAct sub-agents.
+Yields the "Final Answer:" text while the LLM is still generating it.
+"""
+
+from typing import AsyncIterator, Dict
+
+_FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+async def astream_final_answer(executor, inputs: Dict) -> AsyncIterator[str]:
+    """
+    Run an AgentExecutor and yield the text that follows "Final Answer:" as it streams.
+
+    Intermediate Thought/Action steps are not yielded. Nothing is yielded if the
+    agent never reaches a final answer (parsing error, iteration limit).
+    """
+    buffer = ""
+    in_answer = False
+    async for event in executor.astream_events(inputs, version="v2"):
+        kind = event["event"]
+        if kind in ("on_llm_start", "on_chat_model_start"):
+            # New ReAct step: the marker can only appear in this step's output
+            buffer, in_answer = "", False
+            continue
+        if kind not in ("on_llm_stream", "on_chat_model_stream"):
+            continue
+
+        # AIMessageChunk (Online) vs GenerationChunk (Offline)
+        chunk = event["data"]["chunk"]
+        text = chunk.content if hasattr(chunk, "content") else chunk.text
+        if not text:
+            continue
+
+        if in_answer:
+            yield text
+            continue
+
+        buffer += text
+        index = buffer.find(_FINAL_ANSWER_MARKER)
+        if index != -1:
+            in_answer = True
+            rest = buffer[index + len(_FINAL_ANSWER_MARKER):].lstrip()
+            if rest:
+                yield rest
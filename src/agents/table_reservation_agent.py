@@ -1,9 +1,11 @@
 import os
 from datetime import datetime
 from langchain_ollama import OllamaLLM
-from langchain.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
+from core.http_client import get_http_client, get_async_http_client
 from langchain.agents import create_react_agent, Tool,AgentExecutor
 from langchain_core.prompts import PromptTemplate
+from .streaming import astream_final_answer
 from .tools.reservation_tools import (
     check_availability_tool,
     make_reservation_tool,
@@ -14,14 +16,16 @@ from .tools.reservation_tools import (
 
 
 class TableReservationAgent:
-    def __init__(self,isOffline=True):
+    def __init__(self,isOffline=True, model="llama3"):
         if isOffline:
-            self.llm = OllamaLLM(model="llama3", temperature=0)
+            self.llm = OllamaLLM(model=model, temperature=0)
         else:
             api_key = os.getenv("API_KEY_OPENAI")  # Read key from environment variables
             if not api_key:
                 raise ValueError("API_KEY_OPENAI not found in environment variables")
-            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key)
+            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key,
+                                  http_client=get_http_client(),
+                                  http_async_client=get_async_http_client())
         self.tools = self._create_tools()
         self.agent = self._create_agent()
     
@@ -234,6 +238,13 @@ Question: {input}
             if "parsing" in error_msg or "format" in error_msg:
                 return "I had trouble understanding your request. Could you please provide: date, time, number of guests, and your contact information?"
             return f"I apologize, I encountered an error: {str(e)}. Could you please rephrase your request?"
+
+    def astream_process(self, user_input: str):
+        """Stream the final answer of a reservation request as it is generated."""
+        return astream_final_answer(self.agent, {
+            "input": user_input,
+            "today_date": datetime.now().strftime("%Y-%m-%d")
+        })
         
 
 
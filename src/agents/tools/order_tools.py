@@ -1,7 +1,8 @@
+from sqlalchemy import select, update, func
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional, List, Dict
-from database.db_config import SessionLocal
+from database.db_config import get_session, commit_session, rollback_session, close_session
 from database.database import Order, OrderItem, MenuItem
 
 
@@ -25,7 +26,7 @@ class OrderToolsSQL:
         Returns:
             Confirmation message with order ID
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Validate order type
             if order_type not in ["takeaway", "delivery"]:
@@ -42,18 +43,18 @@ class OrderToolsSQL:
             )
             
             db.add(order)
-            db.commit()
-            db.refresh(order)
+            # The INSERT ... RETURNING fills order.id; no refresh SELECT needed
+            commit_session(db)
             
             return (f"Order #{order.id} created for {customer_name} (Phone: {customer_phone}). "
                    f"Order type: {order_type}. "
                    f"You can now add items to your order.")
         
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Error creating order: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def add_item_to_order(
@@ -74,7 +75,7 @@ class OrderToolsSQL:
         Returns:
             Confirmation message with updated total
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Find the order
             order = db.query(Order).filter(Order.id == order_id).first()
@@ -102,40 +103,33 @@ class OrderToolsSQL:
             if existing_item:
                 # Update quantity of existing item
                 existing_item.quantity += quantity
-                existing_item.subtotal = existing_item.quantity * existing_item.unit_price
-                db.flush()  # Ensure update is written before calculating total
+                db.flush()  # Ensure update is written before reading the total
                 message = f"Updated {menu_item.name} quantity to {existing_item.quantity}"
             else:
-                # Add new item
-                subtotal = menu_item.price * quantity
+                # Add new item (subtotal is a generated column)
                 order_item = OrderItem(
                     order_id=order_id,
                     menu_item_id=menu_item.id,
                     quantity=quantity,
                     unit_price=menu_item.price,
-                    subtotal=subtotal,
                     special_requests=special_requests if special_requests else None
                 )
                 db.add(order_item)
-                db.flush()  # Ensure insert is written before calculating total
+                db.flush()  # Ensure insert is written before reading the total
                 message = f"Added {quantity}x {menu_item.name} to order"
             
-            # Update order total
-            order.total_amount = sum(
-                item.subtotal for item in db.query(OrderItem).filter(
-                    OrderItem.order_id == order_id
-                ).all()
-            )
+            # Order total is maintained by the order_items trigger
+            db.refresh(order, attribute_names=["total_amount"])
             
-            db.commit()
+            commit_session(db)
             
             return f"{message}. Current total: €{order.total_amount:.2f}"
         
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Error adding item: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def update_item_quantity(
@@ -154,7 +148,7 @@ class OrderToolsSQL:
         Returns:
             Confirmation message
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Find the order
             order = db.query(Order).filter(Order.id == order_id).first()
@@ -188,25 +182,21 @@ class OrderToolsSQL:
             else:
                 # Update quantity
                 order_item.quantity = new_quantity
-                order_item.subtotal = order_item.unit_price * new_quantity
                 message = f"Updated {menu_item.name} quantity to {new_quantity}"
             
-            # Update order total
-            order.total_amount = sum(
-                item.subtotal for item in db.query(OrderItem).filter(
-                    OrderItem.order_id == order_id
-                ).all()
-            )
+            db.flush()  # Ensure change is written before reading the total
+            # Order total is maintained by the order_items trigger
+            db.refresh(order, attribute_names=["total_amount"])
             
-            db.commit()
+            commit_session(db)
             
             return f"Observation: {message}. Current total: €{order.total_amount:.2f}"
         
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Observation: Error updating item: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def remove_item_from_order(
@@ -236,7 +226,7 @@ class OrderToolsSQL:
         Returns:
             Formatted order details
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Find the order
             order = db.query(Order).filter(Order.id == order_id).first()
@@ -278,7 +268,7 @@ class OrderToolsSQL:
         except Exception as e:
             return f"Error viewing order: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def finalize_order(
@@ -295,41 +285,53 @@ class OrderToolsSQL:
         Returns:
             Confirmation message with estimated time
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
-            # Find the order
-            order = db.query(Order).filter(Order.id == order_id).first()
-            if not order:
-                return f"Order #{order_id} not found"
-            
-            if order.status != "preparing":
-                return f"Order #{order_id} has already been finalized. Status: {order.status}"
-            
-            # Check if order has items
-            item_count = db.query(OrderItem).filter(OrderItem.order_id == order_id).count()
-            if item_count == 0:
-                return f"Cannot finalize empty order #{order_id}. Please add items first."
-            
-            # Update order status
-            order.status = "ready"
+            # Status check, emptiness check and update in a single round trip
+            item_count = (
+                select(func.count(OrderItem.id))
+                .where(OrderItem.order_id == Order.id)
+                .scalar_subquery()
+            )
+            values = {"status": "ready"}
             if special_instructions:
-                order.special_instructions = special_instructions
-            
-            db.commit()
-            
+                values["special_instructions"] = special_instructions
+
+            row = db.execute(
+                update(Order)
+                .where(Order.id == order_id, Order.status == "preparing", item_count > 0)
+                .values(**values)
+                .returning(Order.total_amount, item_count)
+                # Refresh an Order already loaded by an earlier tool of the turn,
+                # so later tools see it is no longer "preparing"
+                .execution_options(synchronize_session="fetch")
+            ).first()
+
+            if row is None:
+                # Nothing updated: find out why (cold path only)
+                order = db.query(Order).filter(Order.id == order_id).first()
+                if not order:
+                    return f"Order #{order_id} not found"
+                if order.status != "preparing":
+                    return f"Order #{order_id} has already been finalized. Status: {order.status}"
+                return f"Cannot finalize empty order #{order_id}. Please add items first."
+
+            commit_session(db)
+            total_amount, item_count = row
+
             # Estimate preparation time (simple logic: 5 min per item)
             estimated_time = item_count * 5
             
-            return (f"Order #{order.id} confirmed and sent to kitchen! "
-                   f"Total: €{order.total_amount:.2f}. "
+            return (f"Order #{order_id} confirmed and sent to kitchen! "
+                   f"Total: €{total_amount:.2f}. "
                    f"Estimated preparation time: {estimated_time} minutes. "
                    f"You will be notified when your order is ready.")
         
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Error finalizing order: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def check_order_status(
@@ -346,7 +348,7 @@ class OrderToolsSQL:
         Returns:
             Order status information
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             if order_id:
                 # Look for specific order
@@ -391,7 +393,7 @@ class OrderToolsSQL:
         except Exception as e:
             return f"Error checking order status: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def cancel_order(
@@ -408,7 +410,7 @@ class OrderToolsSQL:
         Returns:
             Confirmation message
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Find the order
             order = db.query(Order).filter(
@@ -427,16 +429,16 @@ class OrderToolsSQL:
             
             # Cancel the order
             order.status = "cancelled"
-            db.commit()
+            commit_session(db)
             
             return (f"Order #{order_id} has been cancelled successfully. "
                    f"Total amount: €{order.total_amount:.2f}")
         
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Error cancelling order: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
 
 # Tool functions for LangChain/agent integration
@@ -1,8 +1,23 @@
-from sqlalchemy.orm import Session
+import threading
+from cachetools import TTLCache
+from sqlalchemy import Date, and_, bindparam, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased, joinedload, load_only
 from datetime import datetime, date
+from itertools import chain
 from typing import List, Optional, Dict
-from database.db_config import SessionLocal
-from database.database import Reservation, Table, Client
+from database.db_config import (
+    get_session, commit_session, rollback_session, close_session, on_commit, current_turn_session
+)
+from database.database import Reservation, Table, Client, InvalidTimeError, parse_reservation_time
+
+# Short-lived availability answers: a dialog often re-asks the same slot within seconds.
+# Cleared once a booking or cancellation is committed. Until then the turn that made it
+# bypasses the cache, since only its own session sees the change.
+_availability_cache = TTLCache(maxsize=256, ttl=5)
+_availability_cache_lock = threading.Lock()
+
+_INVALID_TIME = "Invalid time format. Please use HH:MM (e.g. 19:30 or 7:30 PM)"
 
 
 class ReservationToolsSQL:
@@ -21,40 +36,46 @@ class ReservationToolsSQL:
         Returns:
             String describing availability
         """
-        db: Session = SessionLocal()
+        cache_key = (date_str, time, num_guests)
+        use_cache = not ReservationToolsSQL._bookings_changed_this_turn()
+        if use_cache:
+            with _availability_cache_lock:
+                cached = _availability_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        db: Session = get_session()
         try:
             # Convert date string to date object
-            reservation_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-            # Find available tables
-            available_table = ReservationToolsSQL._find_available_table(
-                db, reservation_date, time, num_guests
-            )
+            reservation_date = date.fromisoformat(date_str)
 
-            if available_table:
-                # Get all tables that could fit this party
-                suitable_tables = db.query(Table).filter(
-                    Table.capacity >= num_guests,
-                    Table.is_active == True
-                ).all()
+            slot_at = ReservationToolsSQL._slot_at(reservation_date, time)
 
-                available_tables = []
-                for table in suitable_tables:
-                    if not ReservationToolsSQL._is_table_reserved(db, table.id, reservation_date, time):
-                        available_tables.append(table)
+            # Find available tables in a single query
+            available_tables = ReservationToolsSQL._available_tables_query(
+                db, slot_at, num_guests
+            ).all()
 
+            if available_tables:
                 tables_info = ", ".join([f"Table {t.table_number} (capacity: {t.capacity})"
                                         for t in available_tables])
-                return f"Available tables for {num_guests} guests on {date_str} at {time}: {tables_info}"
+                result = f"Available tables for {num_guests} guests on {date_str} at {time}: {tables_info}"
             else:
-                return f"No tables available for {num_guests} guests on {date_str} at {time}"
+                result = f"No tables available for {num_guests} guests on {date_str} at {time}"
 
+            if use_cache:
+                with _availability_cache_lock:
+                    _availability_cache[cache_key] = result
+            return result
+
+        except InvalidTimeError:
+            return _INVALID_TIME
         except ValueError:
             return "Invalid date format. Please use YYYY-MM-DD"
         except Exception as e:
             return f"Error checking availability: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def make_reservation(
@@ -79,21 +100,26 @@ class ReservationToolsSQL:
         Returns:
             Confirmation message or error
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Convert date string to date object
-            reservation_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-
-            # Find or create client
-            client = db.query(Client).filter(Client.phone == phone).first()
-            if not client:
-                client = Client(name=customer_name, phone=phone)
-                db.add(client)
-                db.flush()  # Get the client ID
+            reservation_date = date.fromisoformat(date_str)
+            slot_at = ReservationToolsSQL._slot_at(reservation_date, time)
+
+            # Find or create client in one statement (race-free upsert on unique phone)
+            client_id = db.execute(
+                pg_insert(Client)
+                .values(name=customer_name, phone=phone)
+                .on_conflict_do_update(
+                    index_elements=["phone"],
+                    set_={"name": customer_name, "updated_at": datetime.utcnow()}
+                )
+                .returning(Client.id)
+            ).scalar_one()
 
-            # Find available table
+            # Find and lock an available table (concurrent callers get distinct tables)
             available_table = ReservationToolsSQL._find_available_table(
-                db, reservation_date, time, num_guests
+                db, slot_at, num_guests, for_update=True
             )
 
             if not available_table:
@@ -101,30 +127,36 @@ class ReservationToolsSQL:
 
             # Create reservation
             reservation = Reservation(
-                client_id=client.id,
+                client_id=client_id,
                 table_id=available_table.id,
                 date=reservation_date,
-                time=time,
+                time=slot_at.strftime("%H:%M"),
+                slot_at=slot_at,
                 num_guests=num_guests,
                 status="booked",
                 special_requests=special_requests if special_requests else None
             )
 
             db.add(reservation)
-            db.commit()
+            # Within a turn the booking is only visible to others once session_scope commits
+            ReservationToolsSQL._mark_bookings_changed(db)
+            commit_session(db)
 
             return (f"Reservation confirmed! Table {available_table.table_number} for {num_guests} guests "
                    f"on {date_str} at {time} under the name {customer_name}. "
                    f"Phone: {phone}. {f'Special requests: {special_requests}' if special_requests else ''}")
 
+        except InvalidTimeError:
+            rollback_session(db)
+            return _INVALID_TIME
         except ValueError:
-            db.rollback()
+            rollback_session(db)
             return "Invalid date format. Please use YYYY-MM-DD"
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Error making reservation: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def cancel_reservation(date_str: str, time: str, customer_name: str) -> str:
@@ -139,18 +171,19 @@ class ReservationToolsSQL:
         Returns:
             Confirmation message or error
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             # Convert date string to date object
-            reservation_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            reservation_date = date.fromisoformat(date_str)
 
-            # Find the reservation
+            # Find the reservation (times are stored as HH:MM)
+            reservation_time = ReservationToolsSQL._slot_at(reservation_date, time).strftime("%H:%M")
             reservation = (
                 db.query(Reservation)
                 .join(Client)
                 .filter(
                     Reservation.date == reservation_date,
-                    Reservation.time == time,
+                    Reservation.time == reservation_time,
                     Client.name.ilike(f"%{customer_name}%"),
                     Reservation.status.in_(["booked", "confirmed"])
                 )
@@ -161,17 +194,20 @@ class ReservationToolsSQL:
                 return f"No reservation found for {customer_name} on {date_str} at {time}"
 
             reservation.status = "cancelled"
-            db.commit()
+            ReservationToolsSQL._mark_bookings_changed(db)
+            commit_session(db)
 
             return f"Reservation for {customer_name} on {date_str} at {time} has been cancelled"
 
+        except InvalidTimeError:
+            return _INVALID_TIME
         except ValueError:
             return "Invalid date format. Please use YYYY-MM-DD"
         except Exception as e:
-            db.rollback()
+            rollback_session(db)
             return f"Error cancelling reservation: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def view_reservations(date_str: Optional[str] = None) -> str:
@@ -184,58 +220,73 @@ class ReservationToolsSQL:
         Returns:
             String with reservation details
         """
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
             query = (
-                db.query(Reservation, Client, Table)
-                .join(Client, Reservation.client_id == Client.id)
-                .join(Table, Reservation.table_id == Table.id)
+                db.query(Reservation)
+                .options(
+                    # Only the columns used in the listing
+                    load_only(Reservation.date, Reservation.time, Reservation.num_guests,
+                              Reservation.special_requests),
+                    joinedload(Reservation.client, innerjoin=True).load_only(Client.name, Client.phone),
+                    joinedload(Reservation.table, innerjoin=True).load_only(Table.table_number)
+                )
                 .filter(Reservation.status.in_(["booked", "confirmed"]))
+                # Same SQL with or without a date, so it compiles (and plans) once
+                .filter(or_(
+                    bindparam("reservation_date", type_=Date).is_(None),
+                    Reservation.date == bindparam("reservation_date", type_=Date)
+                ))
             )
 
-            if date_str:
-                reservation_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                query = query.filter(Reservation.date == reservation_date)
+            reservation_date = date.fromisoformat(date_str) if date_str else None
 
-            results = query.order_by(Reservation.date, Reservation.time).all()
+            results = (
+                query.params(reservation_date=reservation_date)
+                .order_by(Reservation.date, Reservation.time)
+                .yield_per(100)
+            )
 
-            if not results:
-                return f"No reservations found{f' for {date_str}' if date_str else ''}"
+            # Stream formatted lines instead of materializing every row
+            reservations = (
+                f"{reservation.date.strftime('%Y-%m-%d')} at {reservation.time} - Table {reservation.table.table_number}: "
+                f"{reservation.client.name} ({reservation.num_guests} guests) - "
+                f"Phone: {reservation.client.phone}"
+                f"{f' - {reservation.special_requests}' if reservation.special_requests else ''}"
+                for reservation in results
+            )
 
-            reservations = []
-            for reservation, client, table in results:
-                date_formatted = reservation.date.strftime("%Y-%m-%d")
-                reservations.append(
-                    f"{date_formatted} at {reservation.time} - Table {table.table_number}: "
-                    f"{client.name} ({reservation.num_guests} guests) - "
-                    f"Phone: {client.phone}"
-                    f"{f' - {reservation.special_requests}' if reservation.special_requests else ''}"
-                )
+            first = next(reservations, None)
+            if first is None:
+                return f"No reservations found{f' for {date_str}' if date_str else ''}"
 
             header = f"Reservations{f' for {date_str}' if date_str else ''}:\n"
-            return header + "\n".join(reservations)
+            return header + "\n".join(chain((first,), reservations))
 
         except ValueError:
             return "Invalid date format. Please use YYYY-MM-DD"
         except Exception as e:
             return f"Error viewing reservations: {str(e)}"
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def get_reservations_by_phone(phone: str) -> List[Dict]:
         """Get all reservations for a specific phone number."""
-        db: Session = SessionLocal()
+        db: Session = get_session()
         try:
-            client = db.query(Client).filter(Client.phone == phone).first()
-            if not client:
-                return []
-
+            # Single statement: filter on the client's phone through the join
+            # instead of looking the client up first
             reservations = (
-                db.query(Reservation, Table)
-                .join(Table, Reservation.table_id == Table.id)
+                db.query(Reservation)
+                .join(Reservation.client)
+                .options(
+                    load_only(Reservation.date, Reservation.time, Reservation.num_guests,
+                              Reservation.status, Reservation.special_requests),
+                    joinedload(Reservation.table, innerjoin=True).load_only(Table.table_number)
+                )
                 .filter(
-                    Reservation.client_id == client.id,
+                    Client.phone == phone,
                     Reservation.status.in_(["booked", "confirmed"])
                 )
                 .order_by(Reservation.date.desc(), Reservation.time.desc())
@@ -248,47 +299,81 @@ class ReservationToolsSQL:
                     "date": r.date.strftime("%Y-%m-%d"),
                     "time": r.time,
                     "num_guests": r.num_guests,
-                    "table_number": t.table_number,
+                    "table_number": r.table.table_number,
                     "status": r.status,
                     "special_requests": r.special_requests
                 }
-                for r, t in reservations
+                for r in reservations
             ]
         finally:
-            db.close()
+            close_session(db)
 
     @staticmethod
     def _find_available_table(
         db: Session,
-        date: date,
-        time: str,
-        num_guests: int
+        slot_at: datetime,
+        num_guests: int,
+        for_update: bool = False
     ) -> Optional[Table]:
-        """Find an available table for the given criteria."""
-        # Get all tables with sufficient capacity
-        suitable_tables = db.query(Table).filter(
-            Table.capacity >= num_guests,
-            Table.is_active == True
-        ).order_by(Table.capacity).all()  # Order by capacity to get smallest suitable table
+        """
+        Find an available table for the given criteria.
 
-        # Check each table for availability
-        for table in suitable_tables:
-            if not ReservationToolsSQL._is_table_reserved(db, table.id, date, time):
-                return table
+        With for_update, the table row stays locked until the transaction ends
+        (SELECT ... FOR UPDATE SKIP LOCKED), so two concurrent reservations
+        can never be handed the same table.
+        """
+        query = ReservationToolsSQL._available_tables_query(db, slot_at, num_guests)
+        if for_update:
+            query = query.with_for_update(skip_locked=True, of=Table)
+        # Smallest suitable table first
+        return query.first()
+
+    @staticmethod
+    def _available_tables_query(db: Session, slot_at: datetime, num_guests: int):
+        """Query active tables that fit the party and have no reservation at this slot."""
+        # LEFT JOIN anti-match: one round trip instead of one query per table
+        conflict = aliased(Reservation)
+        return (
+            db.query(Table)
+            .outerjoin(conflict, and_(
+                conflict.table_id == Table.id,
+                conflict.slot_at == slot_at,
+                conflict.status.in_(["booked", "confirmed"])
+            ))
+            .filter(
+                Table.capacity >= num_guests,
+                Table.is_active == True,
+                conflict.id.is_(None)
+            )
+            .order_by(Table.capacity)
+        )
 
-        return None
 
     @staticmethod
-    def _is_table_reserved(db: Session, table_id: int, date: date, time: str) -> bool:
-        """Check if a table is already reserved for a specific date and time."""
-        existing_reservation = db.query(Reservation).filter(
-            Reservation.table_id == table_id,
-            Reservation.date == date,
-            Reservation.time == time,
-            Reservation.status.in_(["booked", "confirmed"])
-        ).first()
-
-        return existing_reservation is not None
+    def _invalidate_availability_cache():
+        """Drop cached availability answers after a booking changes."""
+        with _availability_cache_lock:
+            _availability_cache.clear()
+
+    @staticmethod
+    def _mark_bookings_changed(db: Session):
+        """
+        Invalidate the availability cache for a booking change made on db: at once for
+        the rest of the turn (see _bookings_changed_this_turn), for everyone on commit.
+        """
+        db.info["bookings_changed"] = True
+        on_commit(db, ReservationToolsSQL._invalidate_availability_cache)
+
+    @staticmethod
+    def _bookings_changed_this_turn() -> bool:
+        """True once the current turn booked or cancelled (its cached answers are stale)."""
+        db = current_turn_session()
+        return db is not None and db.info.get("bookings_changed", False)
+
+    @staticmethod
+    def _slot_at(reservation_date: date, time: str) -> datetime:
+        """Combine a reservation date and a time ("19:30", "7:30 PM", "19h30"...) into a single timestamp."""
+        return datetime.combine(reservation_date, parse_reservation_time(time))
 
 
 # Tool functions for LangChain/agent integration
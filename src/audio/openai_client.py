@@ -0,0 +1,38 @@
+import asyncio
+import os
+import weakref
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """OpenAI client shared by SpeechToText and TextToSpeech.
+
+    One HTTP/2 connection pool for the whole process, so consecutive STT/TTS calls
+    reuse the open TLS connection instead of paying a new handshake each time.
+    """
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+    )
+    return OpenAI(api_key=os.environ.get("API_KEY_OPENAI"), http_client=http_client)
+
+
+# One AsyncOpenAI per event loop: an httpx.AsyncClient's connections belong to the loop they were opened on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_openai_client():
+    """AsyncOpenAI counterpart of get_openai_client for the running event loop (call it from a coroutine)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+        )
+        client = _async_clients[loop] = AsyncOpenAI(api_key=os.environ.get("API_KEY_OPENAI"), http_client=http_client)
+    return client
@@ -1,64 +1,91 @@
-import whisper
+from faster_whisper import WhisperModel
 import os
 import sounddevice as sd
 import numpy as np
 import soundfile as sf
-from openai import OpenAI
+from .openai_client import get_openai_client, get_async_openai_client
 import threading
+from functools import cached_property
+
+# Whisper models shared by every SpeechToText instance, keyed on (model_name, device, compute_type)
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _load_model(model_name, device="cpu", compute_type="int8"):
+    """Load a faster-whisper (CTranslate2) model once per process."""
+    key = (model_name, device, compute_type)
+    with _MODEL_CACHE_LOCK:
+        if key not in _MODEL_CACHE:
+            _MODEL_CACHE[key] = WhisperModel(model_name, device=device, compute_type=compute_type)
+        return _MODEL_CACHE[key]
+
 
 class SpeechToText:
-    def __init__(self,isOffline=True, model_name="base", duration=5, samplerate=16000):
+    def __init__(self,isOffline=True, model_name="base", duration=5, samplerate=16000, device="cpu", compute_type="int8"):
         """Initialize the Speech-to-Text engine."""
         self.duration = duration
         self.samplerate = samplerate
         self.isOffline = isOffline
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type
         
-        if isOffline:
-            self.model = whisper.load_model(model_name)
-        else:
-            self.client = OpenAI(api_key=os.environ.get("API_KEY_OPENAI"))
+        if not isOffline:
+            self.client = get_openai_client()
+    
+    @cached_property
+    def model(self):
+        """Whisper model, loaded on first offline transcription (shared per process)."""
+        return _load_model(self.model_name, self.device, self.compute_type)
     
-    def record_audio(self, filename="static/audioListened/enregistrement.mp3"):
-        """Record audio from microphone until Enter is pressed."""
+    def record_audio(self, max_seconds=120):
+        """Record audio from microphone until Enter is pressed (at most max_seconds)."""
         print("Enregistrement en cours... Appuyez sur Entrée pour arrêter.")
         
-        audio_chunks = []
-        stop_recording = threading.Event()
+        # Preallocated buffer filled in place by the callback (no per-block arrays)
+        buffer = np.empty((max_seconds * self.samplerate, 1), dtype=np.float32)
+        write_ptr = 0
         
-        def record():
-            """Thread d'enregistrement continu."""
-            with sd.InputStream(samplerate=self.samplerate, 
-                            channels=1, 
-                            dtype='float32') as stream:
-                while not stop_recording.is_set():
-                    chunk, overflowed = stream.read(int(self.samplerate * 0.1))
-                    if overflowed:
-                        print("Warning: Audio buffer overflow detected")
-                    audio_chunks.append(chunk)
+        def callback(indata, frames, time_info, status):
+            """Called by PortAudio for each captured block."""
+            nonlocal write_ptr
+            if status:
+                print(f"Warning: {status}")
+            frames = min(frames, len(buffer) - write_ptr)
+            buffer[write_ptr:write_ptr + frames] = indata[:frames]
+            write_ptr += frames
         
-        # Start recording
-        record_thread = threading.Thread(target=record, daemon=True)
-        record_thread.start()
+        # One persistent stream until Enter is pressed
+        with sd.InputStream(samplerate=self.samplerate,
+                            channels=1,
+                            dtype='float32',
+                            blocksize=0,
+                            callback=callback):
+            input()
         
-        # Wait for Enter key
-        input()
-        stop_recording.set()
-        record_thread.join()
+        if write_ptr == len(buffer):
+            print(f"Warning: recording truncated to {max_seconds} seconds")
                 
-        # Mix and save
-        if audio_chunks:
-            audio = np.vstack(audio_chunks)
-            audio_int16 = (audio.flatten() * 32767).astype(np.int16)
-            sf.write(filename, audio_int16, self.samplerate, format='mp3')
-            print(f"Audio sauvegardé sous : {filename}")
-            return filename
+        # Keep the recording in memory (mono float32 at self.samplerate), zero-copy view
+        if write_ptr:
+            return buffer[:write_ptr].ravel()
 
+    def save_audio(self, audio, filename="static/audioListened/enregistrement.wav"):
+        """Save a recording to disk; the format follows the extension (WAV = plain PCM_16)."""
+        # ravel() avoids flatten()'s copy; rint in place, then one cast
+        scaled = audio.ravel() * 32767
+        audio_int16 = np.rint(scaled, out=scaled).astype(np.int16, copy=False)
+        sf.write(filename, audio_int16, self.samplerate)
+        print(f"Audio sauvegardé sous : {filename}")
+        return filename
     
-    def transcribe_offline(self, audio_file):
-        """Offline : Transcribe audio file to text."""
+    def transcribe_offline(self, audio):
+        """Offline : Transcribe audio (file path or float32 16 kHz ndarray) to text."""
         print("[STT Offline]\n")
-        result = self.model.transcribe(audio_file)
-        return result['text']
+        # Greedy decoding; VAD skips silent stretches before decoding
+        segments, _ = self.model.transcribe(audio, beam_size=1, vad_filter=True)
+        return "".join(segment.text for segment in segments)
     
     def transcribe_online(self, audio_file):
         """Online : Transcribe audio file to text."""
@@ -70,11 +97,25 @@ class SpeechToText:
             )
         return transcript.text
     
+    async def transcribe_online_async(self, audio_file):
+        """Online : Transcribe audio file to text without blocking the event loop."""
+        print("[STT Online]\n")
+        with open(audio_file, "rb") as f:
+            transcript = await get_async_openai_client().audio.transcriptions.create(
+                model="whisper-1",
+                file=f
+            )
+        return transcript.text
+    
     def listen(self):
         """Record audio and return transcribed text."""
-        audio_file = self.record_audio()
+        audio = self.record_audio()
+        if audio is None:
+            return None
         if self.isOffline :
-            text = self.transcribe_offline(audio_file)
+            # The model takes the ndarray directly: no encode/decode round trip
+            text = self.transcribe_offline(audio)
         else : 
-            text = self.transcribe_online(audio_file)
+            # MP3 only for the upload, where bytes on the wire matter
+            text = self.transcribe_online(self.save_audio(audio, "static/audioListened/enregistrement.mp3"))
         return text
\ No newline at end of file
@@ -1,15 +1,81 @@
-import pyttsx3
 import os
-from openai import OpenAI
-import time
-import subprocess
-import torch
-import torchaudio
+import asyncio
+import hashlib
+import weakref
+import io
+import re
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from .openai_client import get_openai_client, get_async_openai_client
+
+# Backends lourds (torch, TTS, sounddevice, soundfile, pyttsx3, av) importés à la demande :
+# le chemin téléphone n'utilise que l'API OpenAI et démarre sans les charger.
+
+# Cache des phrases synthétisées (salutations, confirmations, erreurs reviennent souvent)
+_TTS_CACHE_DIR = "static/audioGenerated/cache"
+_TTS_CACHE_MAX_FILES = 500
+_TTS_MEM_CACHE_SIZE = 32
+# Opus côté ordinateur : moins d'octets que le MP3 et premier chunk plus rapide.
+# Le téléphone garde le MP3 (Twilio <Play> ne lit pas l'Opus).
+_COMPUTER_FORMAT = "opus"
+_PHONE_FORMAT = "mp3"
+# Lecture ordinateur : PCM 24 kHz mono (fréquence native de tts-1)
+_PLAYBACK_RATE = 24000
+# Synthèses simultanées max côté téléphone (évite d'épuiser le pool de connexions),
+# pour tous les appels : un sémaphore par boucle d'événements, créé sur la boucle qui l'utilise
+TTS_CONCURRENT_REQUESTS = 3
+_tts_semaphores = weakref.WeakKeyDictionary()
+_tts_mem_cache = OrderedDict()  # key -> audio bytes, hottest phrases only
+_tts_cache_lock = threading.Lock()
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_sentences(text):
+    """Split on sentence-ending punctuation (cheap regex, no NLP tokenizer)."""
+    return [sentence for sentence in _SENTENCE_END_RE.split(text.strip()) if sentence]
+
+
+_pyttsx3_lock = threading.Lock()
+# Set by the engine's 'finished-utterance' callback once the audio has been played
+_pyttsx3_done = threading.Event()
+
+
+@lru_cache(maxsize=1)
+def _get_pyttsx3_engine():
+    """Single pyttsx3 engine for the process (driver init is slow, notably SAPI on Windows)."""
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty("rate", 170)
+    engine.connect("finished-utterance", lambda name, completed: _pyttsx3_done.set())
+    return engine
+
+
+def _tts_semaphore():
+    """Semaphore bounding the async syntheses of the running event loop (call it from a coroutine)."""
+    loop = asyncio.get_running_loop()
+    semaphore = _tts_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _tts_semaphores[loop] = asyncio.Semaphore(TTS_CONCURRENT_REQUESTS)
+    return semaphore
+
+
+def _evict_tts_cache():
+    """Delete the least recently used cached clips once the cache holds too many files."""
+    entries = [e for e in os.scandir(_TTS_CACHE_DIR) if e.name.endswith((".mp3", ".opus"))]
+    if len(entries) <= _TTS_CACHE_MAX_FILES:
+        return
+    entries.sort(key=lambda e: e.stat().st_atime)
+    for entry in entries[:len(entries) - _TTS_CACHE_MAX_FILES]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
 
-#from TTS.tts.configs.xtts_config import XttsConfig
-#from TTS.tts.models.xtts import Xtts
-import sounddevice as sd
-import soundfile as sf
 
 # FONCTIONNE QUE POUR LE TELEPHONE PAS POUR l'ORCHESTRATOR
 class TextToSpeech:
@@ -24,6 +90,10 @@ class TextToSpeech:
         if use_custom_xtts:
             print("[XTTS] Loading custom voice model...")
             try:
+                import torch
+                from TTS.tts.configs.xtts_config import XttsConfig
+                from TTS.tts.models.xtts import Xtts
+                
                 script_dir = os.path.dirname(os.path.abspath(__file__))
                 self.xtts_model_path = os.path.join(script_dir, "tts", "best_model.pth")
                 self.xtts_config_path = os.path.join(script_dir, "tts", "config.json")
@@ -52,10 +122,15 @@ class TextToSpeech:
                 # Move to GPU if available
                 if torch.cuda.is_available():
                     self.xtts_model.cuda()
-                    print("[XTTS] Model loaded on GPU")
+                    # Half precision inference: BF16 when supported (more headroom), else FP16
+                    self._xtts_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                    print(f"[XTTS] Model loaded on GPU ({self._xtts_dtype})")
                 else:
                     print("[XTTS] Model loaded on CPU")
                 
+                # The reference voice never changes: compute its conditioning latents once
+                self.set_reference_voice(self.xtts_reference_wav)
+                
                 print("[XTTS] Custom voice model ready!")
             except Exception as e:
                 print(f"[XTTS] Failed to load custom model: {str(e)}")
@@ -63,54 +138,86 @@ class TextToSpeech:
                 self.use_custom_xtts = False  # Disable custom XTTS on failure
         
         # Initialize engine/client based on isOffline (independent of XTTS)
+        self._audio_stream = None
         if isOffline:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty("rate", 170)
+            _get_pyttsx3_engine()
         else:
-            self.client = OpenAI(api_key=os.environ.get("API_KEY_OPENAI"))
+            self.client = get_openai_client()
         
     def speak_offline(self, text):
         """Use pyttsx3 for offline TTS."""
         print(f"[TTS Offline] Speaking ...")
-        engine = pyttsx3.init()
-        engine.setProperty("rate", 170)
-        engine.say(text)
-        engine.runAndWait()
-        time.sleep(0.5)
+        # Reuse one engine instead of re-initializing the driver on every call
+        # (an online instance falling back from XTTS creates it on first use)
+        with _pyttsx3_lock:
+            engine = _get_pyttsx3_engine()
+            _pyttsx3_done.clear()
+            engine.say(text)
+            engine.runAndWait()
+            # Some drivers return from runAndWait before the tail is played:
+            # wait for the end-of-utterance signal instead of a fixed sleep
+            _pyttsx3_done.wait(timeout=5.0)
     
-    def speak_custom_xtts(self, text, language='en', output_path="static/audioGenerated/output_xtts.wav"):
+    def set_reference_voice(self, reference_wav):
+        """
+        Load a reference wav once onto the model's device and compute its XTTS
+        conditioning latents from the in-memory tensor (same steps as
+        get_conditioning_latents, without re-reading the file).
+        """
+        import torch
+        from TTS.tts.models.xtts import load_audio
+        
+        load_sr = 22050
+        max_ref_seconds = 30
+        audio = load_audio(reference_wav, load_sr)[:, :load_sr * max_ref_seconds]
+        self._ref_audio = audio.to(self.xtts_model.device, non_blocking=True)
+        
+        with torch.inference_mode():
+            speaker_embedding = self.xtts_model.get_speaker_embedding(self._ref_audio, load_sr)
+            gpt_cond_latent = self.xtts_model.get_gpt_cond_latents(
+                self._ref_audio, load_sr, length=6, chunk_length=6
+            )
+        self.xtts_reference_wav = reference_wav
+        self._gpt_cond_latent = gpt_cond_latent.detach()
+        self._speaker_embedding = speaker_embedding.detach()
+    
+    def speak_custom_xtts(self, text, language='en', output_path="static/audioGenerated/output_xtts.wav", save_wav=False):
         """Use custom trained XTTS model for TTS with optimal parameters."""
         print(f"[Custom XTTS] Speaking in {language} ...")
         
         try:
-            # Clear GPU cache before generation (important for 6GB VRAM)
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            
-            # Compute speaker latents from reference audio
-            gpt_cond_latent, speaker_embedding = self.xtts_model.get_conditioning_latents(
-                audio_path=[self.xtts_reference_wav]
-            )
+            import torch
+            import numpy as np
+            import sounddevice as sd
+            import soundfile as sf
             
             # Generate speech with optimal parameters from deployment guide
             # (Moderate settings: balanced quality and stability)
-            out = self.xtts_model.inference(
-                text=text,
-                language=language,  # Dynamic language from detection
-                gpt_cond_latent=gpt_cond_latent,
-                speaker_embedding=speaker_embedding,
-                temperature=0.6,           # Moderate (recommended)
-                repetition_penalty=15.0,   # Moderate (recommended)
-                top_k=15,                  # Moderate (recommended)
-                top_p=0.725,               # Moderate (recommended)
-                length_penalty=2.0,
-            )
+            on_gpu = torch.cuda.is_available()
+            with torch.inference_mode(), torch.autocast("cuda", dtype=getattr(self, "_xtts_dtype", torch.float16), enabled=on_gpu):
+                out = self.xtts_model.inference(
+                    text=text,
+                    language=language,  # Dynamic language from detection
+                    gpt_cond_latent=self._gpt_cond_latent,   # Precomputed at init
+                    speaker_embedding=self._speaker_embedding,
+                    temperature=0.6,           # Moderate (recommended)
+                    repetition_penalty=15.0,   # Moderate (recommended)
+                    top_k=15,                  # Moderate (recommended)
+                    top_p=0.725,               # Moderate (recommended)
+                    length_penalty=2.0,
+                )
             
-            torchaudio.save(output_path, torch.tensor(out["wav"]).unsqueeze(0), 24000)
+            wav = out["wav"]
+            if torch.is_tensor(wav):
+                wav = wav.detach().float().cpu().numpy()
+            wav = np.asarray(wav, dtype=np.float32)
             
-            # Play the audio directly (no file needed, plays immediately)
-            data, samplerate = sf.read(output_path)
-            sd.play(data, samplerate)
+            # Keep a copy on disk only when asked (debugging)
+            if save_wav:
+                sf.write(output_path, wav, 24000)
+            
+            # Play the samples straight from memory: no WAV encode/decode round trip
+            sd.play(wav, 24000)
             sd.wait()
             
             print(f"[Custom XTTS] Audio generated successfully (GPU: {torch.cuda.is_available()})")
@@ -120,44 +227,196 @@ class TextToSpeech:
             print("[Custom XTTS] Falling back to offline TTS")
             self.speak_offline(text)
     
-    def speak_online_computer(self, text, output_path="static/audioGenerated/output_tts_online_computer.mp3"):
+    def _tts_cache_key(self, text, model="tts-1", response_format=_PHONE_FORMAT):
+        return hashlib.sha256(f"{model}|{self.voice}|{response_format}|{text}".encode()).hexdigest()
+    
+    def _cached_audio(self, key, response_format=_PHONE_FORMAT):
+        """Return the cached audio bytes for key (memory first, then disk), or None."""
+        with _tts_cache_lock:
+            audio = _tts_mem_cache.get(key)
+            if audio is not None:
+                _tts_mem_cache.move_to_end(key)
+                return audio
+        
+        cache_path = os.path.join(_TTS_CACHE_DIR, f"{key}.{response_format}")
+        if not os.path.exists(cache_path):
+            return None
+        # Second use of this phrase: keep it in memory for the next ones
+        with open(cache_path, "rb") as f:
+            audio = f.read()
+        os.utime(cache_path)
+        with _tts_cache_lock:
+            _tts_mem_cache[key] = audio
+            if len(_tts_mem_cache) > _TTS_MEM_CACHE_SIZE:
+                _tts_mem_cache.popitem(last=False)
+        return audio
+    
+    @staticmethod
+    def _cache_paths(key, response_format):
+        """(final cache path, unique temporary path) for a synthesis in progress."""
+        os.makedirs(_TTS_CACHE_DIR, exist_ok=True)
+        cache_path = os.path.join(_TTS_CACHE_DIR, f"{key}.{response_format}")
+        return cache_path, f"{cache_path}.{uuid.uuid4().hex}.part"
+    
+    @staticmethod
+    def _publish_cache(tmp_path, cache_path):
+        """Atomically move a complete synthesis into the cache."""
+        os.replace(tmp_path, cache_path)
+        _evict_tts_cache()
+        return cache_path
+    
+    def _synthesize_to_cache(self, key, text, model="tts-1", sink=None, response_format=_PHONE_FORMAT):
+        """Stream the API response into the disk cache, forwarding each chunk to sink if given."""
+        cache_path, tmp_path = self._cache_paths(key, response_format)
+        # Sauvegarder le fichier audio au fil de l'eau (pas de buffer complet en mémoire)
+        with self.client.audio.speech.with_streaming_response.create(
+            model=model,
+            voice=self.voice,
+            input=text,
+            response_format=response_format
+        ) as response, open(tmp_path, "wb") as f:
+            for chunk in response.iter_bytes(4096):
+                f.write(chunk)
+                if sink is not None:
+                    sink(chunk)
+        return self._publish_cache(tmp_path, cache_path)
+    
+    async def _synthesize_to_cache_async(self, key, text, model="tts-1", response_format=_PHONE_FORMAT):
+        """
+        Async variant of _synthesize_to_cache (same cache files), awaiting the network
+        instead of blocking on it. At most TTS_CONCURRENT_REQUESTS run at once per loop.
+        """
+        cache_path, tmp_path = self._cache_paths(key, response_format)
+        async with _tts_semaphore():
+            async with get_async_openai_client().audio.speech.with_streaming_response.create(
+                model=model,
+                voice=self.voice,
+                input=text,
+                response_format=response_format
+            ) as response:
+                with open(tmp_path, "wb") as f:
+                    async for chunk in response.iter_bytes(4096):
+                        f.write(chunk)
+        return self._publish_cache(tmp_path, cache_path)
+    
+    def _synthesize_cached(self, text, output_path, model="tts-1"):
+        """Write the MP3 for (model, voice, text) to output_path, calling the API only on a cache miss."""
+        key = self._tts_cache_key(text, model)
+        audio = self._cached_audio(key)
+        if audio is not None:
+            with open(output_path, "wb") as f:
+                f.write(audio)
+            return
+        shutil.copyfile(self._synthesize_to_cache(key, text, model), output_path)
+    
+    def _get_output_stream(self):
+        """
+        Persistent PCM output stream, opened on first playback and reused for every utterance
+        (stopped after each one by _play_encoded, restarted here without reopening the device).
+        """
+        if self._audio_stream is None:
+            import sounddevice as sd
+            self._audio_stream = sd.RawOutputStream(samplerate=_PLAYBACK_RATE, channels=1, dtype="int16")
+        if self._audio_stream.stopped:
+            self._audio_stream.start()
+        return self._audio_stream
+    
+    def _play_encoded(self, source):
+        """
+        Decode Ogg/Opus in-process (PyAV) and write the PCM to the persistent output stream.
+        Returns once the audio has been played, not just buffered.
+        """
+        import av
+        stream = self._get_output_stream()
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=_PLAYBACK_RATE)
+        with av.open(source, format="ogg") as container:
+            for frame in container.decode(audio=0):
+                for pcm in resampler.resample(frame):
+                    stream.write(pcm.to_ndarray().tobytes())
+            # Flush the resampler's last samples
+            for pcm in resampler.resample(None):
+                stream.write(pcm.to_ndarray().tobytes())
+        # write() returns as soon as the last block is queued: stop() blocks until PortAudio
+        # has played every pending buffer (the device stays open, unlike close())
+        stream.stop()
+    
+    def speak_online_computer(self, text):
         """Use OpenAI API to speak directly on computer."""
         print(f"[TTS Online Computer] {self.voice} Speaking ...")
-        response = self.client.audio.speech.create(
-            model="tts-1",
-            voice=self.voice,
-            input=text
-        )
+        key = self._tts_cache_key(text, response_format=_COMPUTER_FORMAT)
+        audio = self._cached_audio(key, _COMPUTER_FORMAT)
         
-        # Sauvegarder le fichier audio
-        with open(output_path, "wb") as f:
-            f.write(response.read())
-        
-        abs_path = os.path.abspath(output_path)
-        # Lire le fichier selon l'OS
         try:
-            # Lire le fichier avec ffplay et attendre la fin
-            subprocess.run(
-                ["ffplay", "-nodisp", "-autoexit", abs_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True
-            )
+            if audio is not None:
+                self._play_encoded(io.BytesIO(audio))
+                return
+            
+            # Décodage au fil de l'eau : la lecture démarre dès les premiers chunks reçus
+            read_fd, write_fd = os.pipe()
+            errors = []
+            
+            def produce():
+                with os.fdopen(write_fd, "wb", buffering=0) as sink:
+                    try:
+                        self._synthesize_to_cache(key, text, sink=sink.write,
+                                                  response_format=_COMPUTER_FORMAT)
+                    except Exception as e:
+                        errors.append(e)
+            
+            producer = threading.Thread(target=produce, daemon=True)
+            producer.start()
+            with os.fdopen(read_fd, "rb") as source:
+                self._play_encoded(source)
+            producer.join()
+            if errors:
+                raise errors[0]
+        except Exception as e:
+            print(f"Erreur lors de la lecture audio: {e}")
+    
+    def _synth_to_bytes(self, text):
+        """Opus bytes for text, from the cache or the API."""
+        key = self._tts_cache_key(text, response_format=_COMPUTER_FORMAT)
+        audio = self._cached_audio(key, _COMPUTER_FORMAT)
+        if audio is not None:
+            return audio
+        with open(self._synthesize_to_cache(key, text, response_format=_COMPUTER_FORMAT), "rb") as f:
+            return f.read()
+    
+    def _play_bytes(self, audio):
+        """Play Ogg/Opus bytes on the persistent output stream."""
+        try:
+            self._play_encoded(io.BytesIO(audio))
         except Exception as e:
             print(f"Erreur lors de la lecture audio: {e}")
     
+    def speak_online_computer_pipelined(self, sentences):
+        """Synthesize sentence N+1 in the background while sentence N plays."""
+        print(f"[TTS Online Computer] {self.voice} Speaking {len(sentences)} sentences ...")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            ahead = pool.submit(self._synth_to_bytes, sentences[0])
+            for i in range(len(sentences)):
+                audio = ahead.result()
+                if i + 1 < len(sentences):
+                    ahead = pool.submit(self._synth_to_bytes, sentences[i + 1])
+                self._play_bytes(audio)
+    
     def speak_online_phone(self, text, output_path="static/audioGenerated/output_tts_online_phone.mp3"):
         """Use OpenAI API for online TTS."""
         print(f"[TTS Online Phone] {self.voice} Speaking ...")
-        response = self.client.audio.speech.create(
-            model="tts-1",
-            voice=self.voice,
-            input=text
-        )
+        self._synthesize_cached(text, output_path)
         
-        audio_bytes = response.read()
-        with open(output_path, "wb") as f:
-            f.write(audio_bytes)
+        print(f"Audio sauvegardé dans : {output_path}")
+    
+    async def speak_online_phone_async(self, text, output_path="static/audioGenerated/output_tts_online_phone.mp3"):
+        """Async variant of speak_online_phone (same cache), for callers running an event loop."""
+        print(f"[TTS Online Phone] {self.voice} Speaking ...")
+        key = self._tts_cache_key(text)
+        audio = self._cached_audio(key)
+        if audio is not None:
+            with open(output_path, "wb") as f:
+                f.write(audio)
+        else:
+            shutil.copyfile(await self._synthesize_to_cache_async(key, text), output_path)
         
         print(f"Audio sauvegardé dans : {output_path}")
     
@@ -174,4 +433,9 @@ class TextToSpeech:
                 if self.use_offline :
                     self.speak_offline(text)
                 else :
-                    self.speak_online_computer(text)
\ No newline at end of file
+                    sentences = _split_sentences(text)
+                    if len(sentences) > 1:
+                        # First words play after one sentence of synthesis, not the whole answer
+                        self.speak_online_computer_pipelined(sentences)
+                    else:
+                        self.speak_online_computer(text)
\ No newline at end of file
@@ -0,0 +1,27 @@
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache(maxsize=1)
+def get_http_client():
+    """
+    Sync httpx client shared by every ChatOpenAI instance (orchestrator and sub-agents).
+    HTTP/2 with keep-alive: only the first call of the process pays the TCP + TLS handshake.
+    """
+    return httpx.Client(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client():
+    """
+    Async counterpart of get_http_client, for ChatOpenAI's http_async_client
+    (the OpenAI async client only accepts an httpx.AsyncClient).
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+    )
@@ -4,17 +4,143 @@ Simple routing approach - cleaner and more maintainable
 """
 
 from langchain_ollama import OllamaLLM
-from langchain.chat_models import ChatOpenAI
+from langchain_openai import ChatOpenAI
+import asyncio
+import importlib.util
 import sys
 import os
-from typing import List, Dict, Optional
-
-# Add parent directory to path to import agents
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import re
+import json
+import logging
+import string
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+
+# Add parent directory to path to import agents (once, even if re-imported)
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.append(_SRC_DIR)
 
 from agents.general_inqueries_agent import GeneralInqueriesAgent
 from agents.order_handling_agent import OrderHandlingAgent
 from agents.table_reservation_agent import TableReservationAgent
+from database.db_config import session_scope
+from core.http_client import get_http_client, get_async_http_client
+
+# Per-request traces are DEBUG (off by default); errors are WARNING
+logger = logging.getLogger(__name__)
+
+# Keyword fast path: each category is scored by its number of keyword hits; a single
+# clear winner is routed without an LLM call; ties (often compound requests) and
+# no-hits go to the classifier.
+# Menu questions (ingredients, allergens, prices) belong to the general agent.
+# Matched on ASCII bytes (keywords are ASCII; input is English after translation).
+_FAST_PATH_PATTERNS = {
+    "reservation": re.compile(rb"\b(book(ing)?|reserv\w*|tables?|availab\w*)\b"),
+    "order": re.compile(rb"\b(order\w*|takeaway|take away|deliver\w*)\b"),
+    "general": re.compile(rb"\b(hours?|open\w*|clos\w*|location|address|contact|menu|ingredients?|allergens?|price\w*|vegan|vegetarian|gluten)\b"),
+}
+# Agents with no side effects (general: RAG only), the only ones that may run
+# before their intent is confirmed (see Orchestrator._start_speculative)
+_READ_ONLY_INTENTS = ("general",)
+_LOWER_TABLE = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
+
+def _keyword_scores(user_input: str):
+    """(hits, intent) for every category, best first."""
+    text = user_input.encode("ascii", "ignore").translate(_LOWER_TABLE)
+    return sorted(
+        ((len(pattern.findall(text)), intent) for intent, pattern in _FAST_PATH_PATTERNS.items()),
+        reverse=True
+    )
+
+_CLASSIFIER_PROMPT = (
+    "Classify the restaurant customer request as general (hours, location, contact, offers, menu, "
+    "ingredients, allergens, prices, diet), order (food order) or reservation (table booking).\n"
+    "{user_input}\nAnswer:"
+)
+_INTENT_RE = re.compile(r"\b(general|order|reservation)\b")
+
+# Online only: one structured call that routes the request and, when no restaurant
+# data or action is needed (greeting, thanks, small talk), answers it directly.
+_FUSED_ROUTING_PROMPT = """You route customer requests for a restaurant voice assistant.
+Categories:
+- general: opening hours, location, contact, offers, menu, ingredients, allergens, prices, dietary restrictions
+- order: placing, modifying, canceling or checking a food order
+- reservation: booking, modifying, canceling a table, availability
+Set "answer" to a short reply ONLY if the request needs no restaurant information or action (greeting, thanks, small talk). Otherwise "answer" must be null.
+Always write "answer" in English, whatever the language of the request: it is translated back to the customer's language afterwards.
+
+Customer request: {user_input}"""
+
+_FUSED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "routing",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "intent": {"type": "string", "enum": ["general", "order", "reservation"]},
+                "answer": {"type": ["string", "null"]},
+            },
+            "required": ["intent", "answer"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_input(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace (intent cache key)."""
+    return _WHITESPACE_RE.sub(" ", text.lower().translate(_PUNCTUATION_TABLE)).strip()
+
+
+# History sent with each request is capped by tokens, not message count
+_HISTORY_TOKEN_BUDGET = 512
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """gpt-4o-mini tokenizer, or None if tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.encoding_for_model("gpt-4o-mini")
+
+
+def _count_tokens(text: str) -> int:
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return len(text) // 4 + 1  # ~4 characters per token for English
+    return len(tokenizer.encode(text))
+
+
+@lru_cache(maxsize=1)
+def _get_embedder():
+    """Small local sentence embedder for the semantic intent cache, or None if not installed."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+
+
+def _quantize(embedding):
+    """Symmetric int8 quantization of an embedding: (int8 vector, float scale)."""
+    import numpy as np
+    peak = float(np.abs(embedding).max())
+    scale = peak / 127.0 if peak > 0 else 1.0
+    return np.round(embedding / scale).astype(np.int8), scale
 
 
 class Orchestrator:
@@ -22,62 +148,256 @@ class Orchestrator:
     Simple orchestrator that routes requests to specialized sub-agents.
     No complex ReAct pattern - just smart routing.
     """
+
+    # Shared by all instances: translation and routing run side by side
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="orchestrator")
+    # Speculative runs of read-only agents, kept apart so they never delay the routing calls
+    _speculative_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculative")
     
-    def __init__(self,isOffline=True):
+    def __init__(self,isOffline=True, cache_threshold=0.9, cache_size=512,
+                 classifier_model="qwen2.5:1.5b-instruct-q4_K_M", agent_model="llama3"):
+        """
+        Args:
+            isOffline: Use local Ollama models instead of the OpenAI API
+            cache_threshold: Cosine similarity above which a cached intent is reused
+            cache_size: Maximum number of cached intent classifications
+            classifier_model: Ollama model for intent classification (offline). A small
+                quantized model is enough for a one-word answer and much faster than llama3.
+            agent_model: Ollama model for the sub-agents (offline), which need reasoning
+        """
+        self._isOffline = isOffline
+        self._agent_model = agent_model
         if isOffline:
-            self.llm = OllamaLLM(model="llama3", temperature=0)
+            # The classifier answers one word: cap generation at a few tokens
+            self.llm = OllamaLLM(model=classifier_model, temperature=0, num_predict=3, stop=["\n"])
+            self._classifier_llm = self.llm
+            # Ollama does not follow JSON schemas reliably: keep the split classify-then-route mode
+            self._fused_llm = None
         else:
             api_key = os.getenv("API_KEY_OPENAI")  # Read key from environment variables
             if not api_key:
                 raise ValueError("API_KEY_OPENAI not found in environment variables")
-            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key)
+            self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key,
+                                  http_client=get_http_client(),
+                                  http_async_client=get_async_http_client())
+            self._fused_llm = self.llm.bind(response_format=_FUSED_RESPONSE_FORMAT)
+            # Not 1: the reply is free text, so a leading quote, "*" or split capitalized word
+            # ("Res" + "ervation") would be cut before _INTENT_RE can match. The stream is
+            # read only until the category name appears (see _classify_intent).
+            self._classifier_llm = self.llm.bind(max_tokens=2, stop=["\n"])
+
+
+        # Intent cache: normalized utterance -> intent (LRU), plus embeddings for near matches.
+        # The orchestrator is shared by threads (executor, phone calls): one lock guards
+        # the OrderedDict and the embedding rows together.
+        self._cache_lock = threading.Lock()
+        self.cache_threshold = cache_threshold
+        self._cache_size = cache_size
+        self._intent_cache: OrderedDict = OrderedDict()
+        # Embedding index: one preallocated row per cached key, reused on eviction
+        self._emb_matrix = None  # int8 rows, dequantized with _emb_scales
+        self._emb_scales = None
+        self._emb_rows: Dict[str, int] = {}
+        self._emb_row_keys: List[Optional[str]] = [None] * cache_size
+        if importlib.util.find_spec("sentence_transformers") is None:
+            logger.warning("sentence-transformers is not installed: the intent cache only "
+                           "matches exact (normalized) requests, semantic matching is disabled")
+        self.fast_path_hits = 0
+        self.speculative_runs = 0
+
+    # Sub-agents are built on first routing to their intent, not at startup
+    _AGENT_ATTRS = {
+        "general": "general_agent",
+        "order": "order_agent",
+        "reservation": "reservation_agent",
+    }
+
+    def _agent_for(self, intent: str):
+        """Sub-agent handling an intent (built on first use), None if the intent is unknown."""
+        attr = self._AGENT_ATTRS.get(intent)
+        return getattr(self, attr) if attr else None
+
+    @cached_property
+    def general_agent(self) -> GeneralInqueriesAgent:
+        return GeneralInqueriesAgent(self._isOffline, model=self._agent_model)
+
+    @cached_property
+    def order_agent(self) -> OrderHandlingAgent:
+        return OrderHandlingAgent(self._isOffline, model=self._agent_model)
+
+    @cached_property
+    def reservation_agent(self) -> TableReservationAgent:
+        return TableReservationAgent(self._isOffline, model=self._agent_model)
+
+    def _cached_intent(self, key: str):
+        """
+        Look up a previous classification: exact normalized match first,
+        then cosine similarity >= cache_threshold against cached embeddings.
 
-        
-        # Initialize all sub-agents
-        self.general_agent = GeneralInqueriesAgent(isOffline)
-        self.order_agent = OrderHandlingAgent(isOffline)
-        self.reservation_agent = TableReservationAgent(isOffline)
-        
-    def _classify_intent(self, user_input: str) -> str:
+        Returns:
+            (intent or None, embedding of the key or None)
         """
-        Classify user intent using the LLM.
-        Returns: 'general', 'order', or 'reservation'
+        with self._cache_lock:
+            intent = self._intent_cache.get(key)
+            if intent is not None:
+                self._intent_cache.move_to_end(key)
+                return intent, None
+
+        embedder = _get_embedder()
+        if embedder is None:
+            return None, None
+
+        # Encoded outside the lock (slowest step); the scan below needs it
+        embedding = embedder.encode(key, normalize_embeddings=True)
+        with self._cache_lock:
+            if not self._emb_rows:
+                return None, embedding
+            import numpy as np
+            # Unit vectors: one matrix-vector product gives every cosine similarity.
+            # Rows are int8 (4x less memory to scan), accumulated in int32 then rescaled.
+            query, query_scale = _quantize(embedding)
+            raw = np.einsum("ij,j->i", self._emb_matrix, query, dtype=np.int32)
+            scores = raw * self._emb_scales * query_scale
+            best = int(scores.argmax())
+            best_key = self._emb_row_keys[best]
+            if best_key is not None and scores[best] >= self.cache_threshold:
+                self._intent_cache.move_to_end(best_key)
+                return self._intent_cache[best_key], embedding
+        return None, embedding
+
+    def _remember_intent(self, key: str, intent: str, embedding=None):
+        """Store a classification, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._intent_cache[key] = intent
+            self._intent_cache.move_to_end(key)
+            if len(self._intent_cache) > self._cache_size:
+                evicted, _ = self._intent_cache.popitem(last=False)
+                row = self._emb_rows.pop(evicted, None)
+                if row is not None:
+                    # Zeroed rows score 0 and never pass the threshold
+                    self._emb_matrix[row] = 0
+                    self._emb_scales[row] = 0
+                    self._emb_row_keys[row] = None
+
+            if embedding is not None:
+                if self._emb_matrix is None:
+                    import numpy as np
+                    self._emb_matrix = np.zeros((self._cache_size, embedding.shape[0]), dtype=np.int8)
+                    self._emb_scales = np.zeros(self._cache_size, dtype=np.float32)
+                row = self._emb_rows.get(key)
+                if row is None:
+                    row = self._emb_row_keys.index(None)
+                    self._emb_rows[key] = row
+                    self._emb_row_keys[row] = key
+                self._emb_matrix[row], self._emb_scales[row] = _quantize(embedding)
+
+    def _fast_path_intent(self, user_input: str) -> Optional[str]:
+        """
+        Keyword routing for the current utterance alone.
+        Returns the intent with strictly the most keyword hits, else None (ask the LLM).
         """
-        prompt = f"""You are a classifier for a restaurant. Analyze the customer's request and determine the category.
+        (best_score, best_intent), (runner_up, _) = _keyword_scores(user_input)[:2]
+        if best_score == 0 or best_score == runner_up:
+            return None
+        self.fast_path_hits += 1
+        return best_intent
 
+    def _start_speculative(self, utterance: str, agent_input: str) -> Tuple[Optional[str], Optional[Future]]:
+        """
+        On a keyword tie, start the read-only candidate while the LLM classifies.
 
-            Available categories:
-            - general: General questions (opening hours, location, contact, special offers, menu information, ingredients, allergens, prices, dietary restrictions)
-            - order: Food orders (placing an order, modifying an order, canceling, order status)
-            - reservation: Table reservations (book, modify, cancel, availability)
+        Only agents of _READ_ONLY_INTENTS (general: RAG lookups, no DB session) may
+        run before the intent is known: their result is simply dropped if another
+        intent wins. Order and reservation agents write, so they never run speculatively.
 
-            Customer request: {user_input}
+        Returns:
+            (intent, future) of the speculative run, or (None, None)
+        """
+        scores = _keyword_scores(utterance)
+        best_score = scores[0][0]
+        if best_score == 0:
+            return None, None
+        tied = [intent for score, intent in scores if score == best_score]
+        for intent in tied:
+            agent = self._agent_for(intent) if intent in _READ_ONLY_INTENTS else None
+            if agent is not None:
+                self.speculative_runs += 1
+                return intent, self._speculative_executor.submit(agent.process, agent_input)
+        return None, None
+
+    def _classify_intent(self, user_input: str, utterance: Optional[str] = None,
+                         use_cache: bool = True) -> str:
+        """
+        Classify user intent using the LLM.
+
+        Args:
+            user_input: The request sent to the classifier (with its context)
+            utterance: The current request alone, which keys the intent cache
+                (defaults to user_input)
+            use_cache: Look up and store the intent cache (see _route_fused)
+
+        Returns: 'general', 'order', or 'reservation'
+        """
+        cache_key = _normalize_input(user_input if utterance is None else utterance)
+        intent, embedding = self._cached_intent(cache_key) if use_cache else (None, None)
+        if intent is not None:
+            return intent
 
-            Respond ONLY with a single word from: general, order, reservation"""
+        prompt = _CLASSIFIER_PROMPT.format(user_input=user_input)
         try:
-            llm_response = self.llm.invoke(prompt)
-            
-            # Handle different response types (AIMessage (Online) vs string (Offline))
-            if hasattr(llm_response, 'content'):
-                response = llm_response.content.strip().lower()
-            else:
-                response = str(llm_response).strip().lower()
-            
-            # Extract the category from the response
-            if "general" in response:
-                return "general"
-            elif "order" in response:
-                return "order"
-            elif "reservation" in response:
-                return "reservation"
-            else:
-                # Default to general if unclear
-                return "general"
+            # Stream and stop reading as soon as a category name has been generated
+            response = ""
+            match = None
+            for chunk in self._classifier_llm.stream(prompt):
+                # Handle different chunk types (AIMessageChunk (Online) vs string (Offline))
+                response += (chunk.content if hasattr(chunk, 'content') else str(chunk)).lower()
+                match = _INTENT_RE.search(response)
+                if match:
+                    break
+
+            # Extract the category from the response (default to general if unclear)
+            intent = match.group(1) if match else "general"
+
+            if use_cache:
+                self._remember_intent(cache_key, intent, embedding)
+            return intent
                 
         except Exception as e:
-            print(f"Classification error: {e}")
+            logger.warning("Classification error: %s", e)
             return "general"  # Default fallback
     
+    def _route_fused(self, user_input: str, utterance: Optional[str] = None, use_cache: bool = True):
+        """
+        Online routing in a single structured-output call.
+
+        Args:
+            user_input: The request (with its context)
+            utterance: The current request alone, which keys the intent cache
+                (defaults to user_input)
+            use_cache: Look up and store the intent cache. Off for untranslated input,
+                whose keys would not match the English requests cached elsewhere.
+
+        Returns:
+            (intent, answer): answer is the direct reply when no sub-agent is needed, else None
+        """
+        cache_key = _normalize_input(user_input if utterance is None else utterance)
+        intent, embedding = self._cached_intent(cache_key) if use_cache else (None, None)
+        if intent is not None:
+            return intent, None
+
+        try:
+            llm_response = self._fused_llm.invoke(_FUSED_ROUTING_PROMPT.format(user_input=user_input))
+            routing = json.loads(llm_response.content)
+            intent = routing["intent"]
+            answer = routing.get("answer")
+            if use_cache and not answer:
+                # Only cache pure routing decisions, not turns answered directly
+                self._remember_intent(cache_key, intent, embedding)
+            return intent, answer or None
+        except Exception as e:
+            logger.warning("Fused routing error: %s", e)
+            return self._classify_intent(user_input, utterance, use_cache), None
+
     def _build_context(self, current_input: str, history: List[Dict]) -> str:
         """
         Build enriched context by combining conversation history with current input.
@@ -93,13 +413,19 @@ class Orchestrator:
         if not history or len(history) == 0:
             return current_input
 
-        # Take last 5 exchanges (10 messages) for context
-        recent_history = history[-10:] if len(history) > 10 else history
+        # Newest messages first, within the token budget (at most 5 exchanges / 10 messages)
+        recent_lines = []
+        budget = _HISTORY_TOKEN_BUDGET
+        for msg in reversed(history[-10:]):
+            role = "Customer" if msg["role"] == "user" else "Assistant"
+            line = f"{role}: {msg['content']}"
+            budget -= _count_tokens(line)
+            if budget < 0:
+                break
+            recent_lines.append(line)
 
         context_parts = ["Previous conversation context:"]
-        for msg in recent_history:
-            role = "Customer" if msg["role"] == "user" else "Assistant"
-            context_parts.append(f"{role}: {msg['content']}")
+        context_parts.extend(reversed(recent_lines))
 
         context_parts.append(f"\nCurrent customer request: {current_input}")
 
@@ -143,13 +469,65 @@ class Orchestrator:
         else:
             return f"Let me try again - {user_input}"
     
-    def process_request(self, user_input: str, conversation_history: Optional[List[Dict]] = []) -> str:
+    def _pre_route(self, raw_input: str, history: List[Dict]):
+        """
+        Online routing of the untranslated utterance (gpt-4o-mini is multilingual).
+        Keywords and the intent cache are English-only, so both are skipped here.
+
+        Returns:
+            (intent, answer) as returned by _route_fused
+        """
+        return self._route_fused(self._build_context(raw_input, history), use_cache=False)
+
+    def translate_and_classify(self, raw_input: str, language_processor,
+                               conversation_history: Optional[List[Dict]] = None):
+        """
+        Translate the utterance to English and, online, route it concurrently,
+        so the turn pays max(translation, routing) instead of their sum.
+
+        Offline, the classifier needs English input (keywords and prompt are English):
+        the intent is left to process_request, which classifies after translation.
+
+        Returns:
+            (english_input, original_language, intent, direct_answer): intent to pass to
+            process_request (None offline), direct_answer to use instead of it when set
+            (always English, like the agents' answers, even though the router saw the raw input)
+        """
+        history = conversation_history or []
+        if self._fused_llm is None:
+            english_input, original_language = language_processor.process_input(raw_input)
+            return english_input, original_language, None, None
+        translate_future = self._executor.submit(language_processor.process_input, raw_input)
+        route_future = self._executor.submit(self._pre_route, raw_input, history)
+        english_input, original_language = translate_future.result()
+        intent, direct_answer = route_future.result()
+        return english_input, original_language, intent, direct_answer
+
+    async def translate_and_classify_async(self, raw_input: str, language_processor,
+                                           conversation_history: Optional[List[Dict]] = None):
+        """Async variant of translate_and_classify (asyncio.gather over the shared executor)."""
+        history = conversation_history or []
+        loop = asyncio.get_running_loop()
+        if self._fused_llm is None:
+            english_input, original_language = await loop.run_in_executor(
+                self._executor, language_processor.process_input, raw_input)
+            return english_input, original_language, None, None
+        (english_input, original_language), (intent, direct_answer) = await asyncio.gather(
+            loop.run_in_executor(self._executor, language_processor.process_input, raw_input),
+            loop.run_in_executor(self._executor, self._pre_route, raw_input, history),
+        )
+        return english_input, original_language, intent, direct_answer
+
+    def process_request(self, user_input: str, conversation_history: Optional[List[Dict]] = [],
+                        precomputed_intent: Optional[str] = None) -> str:
         """
         Process user request by routing to the appropriate sub-agent with retry logic.
 
         Args:
             user_input: The user's question or request
             conversation_history: Optional conversation history for context
+            precomputed_intent: Intent already classified (see translate_and_classify),
+                used on the first attempt instead of classifying again
 
         Returns:
             The response from the appropriate sub-agent
@@ -163,40 +541,58 @@ class Orchestrator:
                 current_input = original_input
                 if attempt == 0 and len(conversation_history) != 0:
                     current_input = self._build_context(original_input, conversation_history)
-                    print(f"[Orchestrator] Use context for answering")
+                    logger.debug("Use context for answering")
                 elif attempt > 0:
                     # On retry, use simpler rephrased version
                     current_input = self._rephrase_for_retry(original_input, attempt)
-                    print(f"[Orchestrator] Retry attempt {attempt}")
-
-                # Step 2: Classify the intent (using context if available)
-                intent = self._classify_intent(current_input)
-                print(f"[Orchestrator] Classified intent: {intent}")
+                    logger.debug("Retry attempt %d", attempt)
+
+                # Step 2: Classify the intent: keywords of the utterance first,
+                # then the LLM (using context if available)
+                speculative_intent, speculative = None, None
+                if attempt == 0 and precomputed_intent is not None:
+                    intent = precomputed_intent
+                    logger.debug("Pre-classified intent: %s", intent)
+                elif (intent := self._fast_path_intent(original_input)) is not None:
+                    logger.debug("Fast-path intent: %s (hits: %d)", intent, self.fast_path_hits)
+                elif self._fused_llm is not None:
+                    # Online: routing and simple answers share one LLM round trip
+                    speculative_intent, speculative = self._start_speculative(original_input, current_input)
+                    intent, direct_answer = self._route_fused(current_input, original_input)
+                    if direct_answer:
+                        logger.debug("Answered directly while routing")
+                        return direct_answer
+                    logger.debug("Classified intent: %s", intent)
+                else:
+                    speculative_intent, speculative = self._start_speculative(original_input, current_input)
+                    intent = self._classify_intent(current_input, original_input)
+                    logger.debug("Classified intent: %s", intent)
 
                 # Step 3: Route to the appropriate sub-agent with context
-                response = None
-                if intent == "general":
-                    response = self.general_agent.process(current_input)
-                elif intent == "order":
-                    response = self.order_agent.process(current_input)
-                elif intent == "reservation":
-                    response = self.reservation_agent.process(current_input)
-                else:
+                # (all tool calls of this turn share one DB session, committed once)
+                agent = self._agent_for(intent)
+                if agent is None:
                     response = "I am sorry, I didn't understand your question"
+                elif speculative is not None and speculative_intent == intent:
+                    logger.debug("Using the speculative %s answer", intent)
+                    response = speculative.result()
+                else:
+                    with session_scope():
+                        response = agent.process(current_input)
 
                 # Step 4: Check if response indicates an error
                 if not self._is_error_response(response):
                     # Success! Return the response
                     return response
                 else:
-                    print(f"[Orchestrator] Error detected in response, attempt {attempt + 1}/{max_retries + 1}")
+                    logger.warning("Error detected in response, attempt %d/%d", attempt + 1, max_retries + 1)
                     # If this was the last attempt, return the error response
                     if attempt == max_retries:
                         return response
                     # Otherwise, continue to next retry
 
             except Exception as e:
-                print(f"[Orchestrator] Exception on attempt {attempt + 1}: {str(e)}")
+                logger.warning("Exception on attempt %d: %s", attempt + 1, e)
                 # If this was the last attempt, return error
                 if attempt == max_retries:
                     return f"I apologize, but I encountered an error: {str(e)}"
@@ -206,9 +602,83 @@ class Orchestrator:
         return "I apologize, but I was unable to process your request after multiple attempts."
 
 
+    async def astream_request(self, user_input: str,
+                              conversation_history: Optional[List[Dict]] = None,
+                              precomputed_intent: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Streaming variant of process_request: yields the answer sentence by sentence
+        while the sub-agent is still generating it, so TTS can start on the first one.
+
+        There is no retry loop here, since sentences already spoken cannot be taken back.
+        If the agent produced no streamable final answer, its DB work is rolled back
+        and the turn falls back to process_request.
+
+        Args:
+            user_input: The user's question or request
+            conversation_history: Optional conversation history for context
+            precomputed_intent: Intent already classified (see translate_and_classify)
+
+        Yields:
+            Complete sentences of the response
+        """
+        history = conversation_history or []
+        current_input = self._build_context(user_input, history) if history else user_input
+
+        intent = precomputed_intent or self._fast_path_intent(user_input)
+        if intent is None:
+            if self._fused_llm is not None:
+                intent, direct_answer = await asyncio.to_thread(self._route_fused, current_input, user_input)
+                if direct_answer:
+                    yield direct_answer
+                    return
+            else:
+                intent = await asyncio.to_thread(self._classify_intent, current_input, user_input)
+        logger.debug("Streaming intent: %s", intent)
+
+        agent = self._agent_for(intent) or self.general_agent
+        stream = agent.astream_process(current_input)
+
+        # The final answer only starts once the agent's last tool call is done: the turn's
+        # session is committed and closed on its first chunk, before anything is yielded,
+        # so no DB lock is held while the caller speaks the sentences
+        with session_scope() as db:
+            first_chunk = await anext(stream, None)
+            if first_chunk is None:
+                db.rollback()  # process_request redoes the whole turn below
+
+        if first_chunk is None:
+            yield await asyncio.to_thread(self.process_request, user_input, history, intent)
+            return
+
+        buffer = first_chunk
+        streamed = False
+        while True:
+            # Everything before the last sentence break is complete
+            *sentences, buffer = _SENTENCE_END_RE.split(buffer)
+            for sentence in sentences:
+                if sentence.strip():
+                    streamed = True
+                    yield sentence.strip()
+            chunk = await anext(stream, None)
+            if chunk is None:
+                break
+            buffer += chunk
+
+        if buffer.strip():
+            streamed = True
+            yield buffer.strip()
+        if not streamed:
+            yield await asyncio.to_thread(self.process_request, user_input, history, intent)
+
+
+_ORCH: Optional[Orchestrator] = None
+_ORCH_LOCK = threading.Lock()
+
+
 def orchestrator(user_input: str) -> str:
     """
     Main orchestrator function.
+    The Orchestrator is built on the first call and reused afterwards.
     
     Args:
         user_input: The user's question or request
@@ -216,12 +686,17 @@ def orchestrator(user_input: str) -> str:
     Returns:
         The response from the appropriate sub-agent
     """
-    orch = Orchestrator(False)
-    return orch.process_request(user_input)
+    global _ORCH
+    if _ORCH is None:
+        with _ORCH_LOCK:
+            if _ORCH is None:
+                _ORCH = Orchestrator(False)
+    return _ORCH.process_request(user_input)
 
 
 if __name__ == "__main__":
-    # Test the orchestrator
+    # Test the orchestrator (show routing traces)
+    logging.basicConfig(level=logging.DEBUG, format="[%(name)s] %(message)s")
     orchestrator_instance = Orchestrator(False)
     
     test_queries = [
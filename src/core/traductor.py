@@ -1,13 +1,44 @@
+import logging
+import re
 from langdetect import detect, LangDetectException
 from deep_translator import GoogleTranslator
 
+logger = logging.getLogger(__name__)
+
+# Function words of the other languages we serve (FR/ES/DE/IT). An ASCII text with none
+# of them is only a candidate for English: see _ENGLISH_RE below.
+_NON_ENGLISH_RE = re.compile(
+    r"\b(el|la|le|les|des|du|une?|der|die|das|den|dem|il|una|uno|und|et|est|je|tu|nous|vous|"
+    r"pour|avec|que|qui|pas|y|o|por|para|con|los|las|es|ich|ist|nicht|mit|che|non|per|sono|"
+    r"bonjour|merci|hola|gracias|hallo|danke|ciao|grazie)\b",
+    re.IGNORECASE
+)
+# English function words (none of them is a word of FR/ES/DE/IT). The langdetect call is
+# skipped only on positive evidence: enough words, several of them from this list.
+# Short answers ("Oui", "Bonsoir", "Quiero reservar mesa") still go to langdetect.
+_ENGLISH_RE = re.compile(
+    r"\b(the|is|are|you|we|my|your|our|to|of|for|and|with|at|it|this|that|does|"
+    r"can|could|would|what|when|where|how|please|have|want|like|there|be)\b",
+    re.IGNORECASE
+)
+_ENGLISH_MIN_WORDS = 3
+_ENGLISH_MIN_HITS = 2
+
 class LanguageProcessor:
     def __init__(self):
         self.translator = GoogleTranslator(source='auto', target='en')
         self.detected_language = 'en'
+        # One en->target translator per output language, reused across responses
+        self._out_translators: dict[str, GoogleTranslator] = {}
     
     def detect_language(self, text: str) -> str:
         """Detect the language of the input text."""
+        # Fast path: plain ASCII, several English function words and no foreign ones
+        if (text.isascii() and len(text.split()) >= _ENGLISH_MIN_WORDS
+                and len(set(m.lower() for m in _ENGLISH_RE.findall(text))) >= _ENGLISH_MIN_HITS
+                and not _NON_ENGLISH_RE.search(text)):
+            self.detected_language = 'en'
+            return 'en'
         try:
             lang = detect(text)
             self.detected_language = lang
@@ -30,19 +61,21 @@ class LanguageProcessor:
             translated = self.translator.translate(text)
             return translated, lang
         except Exception as e:
-            print(f"Translation error: {e}")
+            logger.warning("Translation error: %s", e)
             return text, lang
     
     def translate_from_english(self, text: str, target_lang: str) -> str:
         """Translate response back to original language."""
-        if target_lang == 'en':
+        if target_lang == 'en' or not text.strip():
             return text
         
         try:
-            translator = GoogleTranslator(source='en', target=target_lang)
+            translator = self._out_translators.get(target_lang)
+            if translator is None:
+                translator = self._out_translators[target_lang] = GoogleTranslator(source='en', target=target_lang)
             return translator.translate(text)
         except Exception as e:
-            print(f"Translation error: {e}")
+            logger.warning("Translation error: %s", e)
             return text
     
     def process_input(self, text: str) -> tuple[str, str]:
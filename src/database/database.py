@@ -1,8 +1,46 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Date
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Date, Computed, DDL, Index, event
 from sqlalchemy.orm import relationship
-from datetime import datetime
+import re
+from datetime import datetime, date as dt_date, time as dt_time
 from .db_config import Base
 
+# Spoken/typed times: "19:30", "19:30:00", "7pm", "7:30 PM", "7.30 p.m.", "19h", "19h30"
+_TIME_RE = re.compile(
+    r"(?P<hour>\d{1,2})(?:\s*[:h.]\s*(?P<minute>\d{2})?(?::\d{2})?)?"
+    r"\s*(?:(?P<meridiem>[ap])\.?\s*m\.?)?",
+    re.IGNORECASE
+)
+
+class InvalidTimeError(ValueError):
+    """A reservation time that parse_reservation_time cannot read."""
+
+def parse_reservation_time(value: str) -> dt_time:
+    """
+    Parse a reservation time, 24h or 12h (AM/PM), with ":", "." or "h" separators.
+
+    Raises:
+        InvalidTimeError: the text is not a time of day
+    """
+    match = _TIME_RE.fullmatch((value or "").strip())
+    if match is None:
+        raise InvalidTimeError(f"Invalid time: {value!r}")
+    hour, minute = int(match["hour"]), int(match["minute"] or 0)
+    if match["meridiem"]:
+        if not 1 <= hour <= 12:
+            raise InvalidTimeError(f"Invalid time: {value!r}")
+        hour = hour % 12 + (12 if match["meridiem"].lower() == "p" else 0)
+    if hour > 23 or minute > 59:
+        raise InvalidTimeError(f"Invalid time: {value!r}")
+    return dt_time(hour, minute)
+
+def _default_slot_at(context):
+    """slot_at of a row inserted without one (seeds, bulk inserts): its date + time."""
+    params = context.get_current_parameters()
+    reservation_date = params["date"]
+    if isinstance(reservation_date, str):
+        reservation_date = dt_date.fromisoformat(reservation_date)
+    return datetime.combine(reservation_date, parse_reservation_time(params["time"]))
+
 class Client(Base):
     __tablename__ = "clients"
 
@@ -24,6 +62,8 @@ class Reservation(Base):
     table_id = Column(Integer, ForeignKey("tables.id"), nullable=False)
     date = Column(Date, nullable=False, index=True)
     time = Column(String(10), nullable=False)
+    # date + time, for slot/range queries; filled from date and time when not given
+    slot_at = Column(DateTime(timezone=True), nullable=False, default=_default_slot_at)
     num_guests = Column(Integer, nullable=False)
     status = Column(String(20), default="booked")  # booked, cancelled, completed
     special_requests = Column(Text)
@@ -34,12 +74,19 @@ class Reservation(Base):
     client = relationship("Client", back_populates="reservations")
     table = relationship("Table", back_populates="reservations")
 
+    __table_args__ = (
+        # Availability checks filter on (table_id, slot_at, status)
+        Index("ix_res_table_slot_status", "table_id", "slot_at", "status"),
+        # Lookups by client filter on status and order by date
+        Index("ix_res_client_status_date", "client_id", "status", "date"),
+    )
+
 class MenuItem(Base):
     __tablename__ = "menu_items"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
-    category = Column(String(50), nullable=False)  # appetizer, main, dessert, drink
+    category = Column(String(50), nullable=False, index=True)  # appetizer, main, dessert, drink
     description = Column(Text)
     price = Column(Float, nullable=False)
     is_available = Column(Boolean, default=True)
@@ -53,7 +100,7 @@ class Order(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     customer_name = Column(String(100))
-    customer_phone = Column(String(20))
+    customer_phone = Column(String(20), index=True)
     table_number = Column(Integer)
     total_amount = Column(Float, default=0.0)
     status = Column(String(20), default="pending")  # pending, preparing, ready, delivered, cancelled
@@ -73,13 +120,36 @@ class OrderItem(Base):
     menu_item_id = Column(Integer, ForeignKey("menu_items.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
-    subtotal = Column(Float, nullable=False)
+    subtotal = Column(Float, Computed("quantity * unit_price", persisted=True))
     special_requests = Column(Text)
     
     # Relations
     order = relationship("Order", back_populates="items")
     menu_item = relationship("MenuItem")
 
+# Keep orders.total_amount in sync with its order_items on every insert/update/delete
+order_total_trigger = DDL("""
+CREATE OR REPLACE FUNCTION refresh_order_total() RETURNS trigger AS $$
+DECLARE
+    target_order_id INTEGER := COALESCE(NEW.order_id, OLD.order_id);
+BEGIN
+    UPDATE orders
+    SET total_amount = COALESCE(
+        (SELECT SUM(subtotal) FROM order_items WHERE order_id = target_order_id), 0
+    )
+    WHERE id = target_order_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS order_items_refresh_total ON order_items;
+CREATE TRIGGER order_items_refresh_total
+AFTER INSERT OR UPDATE OR DELETE ON order_items
+FOR EACH ROW EXECUTE FUNCTION refresh_order_total();
+""")
+
+event.listen(OrderItem.__table__, "after_create", order_total_trigger.execute_if(dialect="postgresql"))
+
 class Table(Base):
     __tablename__ = "tables"
 
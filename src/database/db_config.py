@@ -1,7 +1,11 @@
 import os
-from sqlalchemy import create_engine
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,15 +20,31 @@ DB_NAME = os.getenv("DB_NAME", "restaurant_db")
 # Construction de l'URL de connexion
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=True, pool_pre_ping=True)
+# Create SQLAlchemy engine (pooled connections are reused across tool calls)
+engine = create_engine(
+    DATABASE_URL,
+    echo=os.getenv("DB_ECHO", "0") == "1",  # SQL logging only when DB_ECHO=1 (debug)
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),      # warm connections kept open
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),  # extra connections under bursts
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_timeout=5,
+    executemany_mode="values_plus_batch",  # psycopg2: multi-row VALUES for INSERT, batched UPDATE/DELETE
+)
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory (no expiry on commit: avoids refetching rows read after commit)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base for models
 Base = declarative_base()
 
+# Last successful health check (test_connection skips the round-trip within the TTL)
+_HEALTH_TTL = 30.0
+_last_ok_ts = 0.0
+
+# Session shared by every tool call of the current agent turn (see session_scope)
+_current_session: ContextVar[Optional[Session]] = ContextVar("_current_session", default=None)
+
 def get_db():
     """Get a database session."""
     db = SessionLocal()
@@ -33,6 +53,95 @@ def get_db():
     finally:
         db.close()
 
+@contextmanager
+def session_scope():
+    """Share one session across all tool calls of a turn and commit once at the end."""
+    db = SessionLocal()
+    token = _current_session.set(db)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        db.close()
+
+def current_turn_session() -> Optional[Session]:
+    """The turn-scoped session if one is active (no savepoint is opened), else None."""
+    return _current_session.get()
+
+def get_session() -> Session:
+    """
+    Get the turn-scoped session if one is active, otherwise a new session.
+
+    On the turn-scoped session each tool call runs inside its own SAVEPOINT, so a
+    failing tool only undoes its own work, not the earlier tools of the turn.
+    """
+    db = _current_session.get()
+    if db is None:
+        return SessionLocal()
+    db.info.setdefault("tool_savepoints", []).append(db.begin_nested())
+    return db
+
+def _tool_savepoint(db: Session, pop: bool = False):
+    """Savepoint of the innermost tool call on the turn-scoped session (None if none)."""
+    savepoints = db.info.get("tool_savepoints")
+    if not savepoints:
+        return None
+    return savepoints.pop() if pop else savepoints[-1]
+
+def commit_session(db: Session):
+    """Commit an owned session; release the tool's savepoint on a turn-scoped one (committed by session_scope)."""
+    if db is _current_session.get():
+        savepoint = _tool_savepoint(db)
+        if savepoint is not None and savepoint.is_active:
+            savepoint.commit()
+        else:
+            db.flush()
+    else:
+        db.commit()
+
+def rollback_session(db: Session):
+    """Roll back an owned session; only the tool's savepoint on a turn-scoped one."""
+    if db is _current_session.get():
+        savepoint = _tool_savepoint(db)
+        if savepoint is not None and savepoint.is_active:
+            savepoint.rollback()
+    else:
+        db.rollback()
+
+def close_session(db: Session):
+    """Close an owned session; a turn-scoped one is closed by session_scope."""
+    if db is not _current_session.get():
+        db.close()
+        return
+    # End of the tool call: uncommitted changes are dropped, as closing an owned session would
+    savepoint = _tool_savepoint(db, pop=True)
+    if savepoint is not None and savepoint.is_active:
+        savepoint.rollback()
+
+def on_commit(db: Session, callback: Callable[[], None]):
+    """
+    Run callback once db's transaction is really committed: at the end of the turn for
+    the turn-scoped session (session_scope), else on commit_session. Dropped on rollback.
+    Register it before commit_session.
+    """
+    db.info.setdefault("on_commit", []).append(callback)
+
+@event.listens_for(SessionLocal, "after_commit")
+def _run_on_commit(session: Session):
+    if session.in_nested_transaction():
+        return  # a tool's savepoint: the turn's transaction can still roll back
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _drop_on_commit(session: Session, transaction):
+    if transaction.parent is None:
+        session.info.pop("on_commit", None)  # rolled back: nothing was committed
+
 def init_db():
     """Initialize database (create all tables)."""
     from .database import Client, Reservation, Table, MenuItem, Order, OrderItem
@@ -40,10 +149,14 @@ def init_db():
     print("[SUCCESS] Tables created successfully!")
 
 def test_connection():
-    """Test database connection."""
+    """Test database connection (a success is cached for _HEALTH_TTL seconds)."""
+    global _last_ok_ts
+    if time.monotonic() - _last_ok_ts < _HEALTH_TTL:
+        return True
     try:
-        connection = engine.connect()
-        connection.close()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        _last_ok_ts = time.monotonic()
         print("[SUCCESS] Database connection successful!")
         return True
     except Exception as e:
@@ -9,6 +9,8 @@ This script will:
 import sys
 import os
 
+from sqlalchemy import insert
+
 # Add parent directory to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
@@ -37,10 +39,7 @@ def create_initial_tables():
             {"table_number": 5, "capacity": 8, "location": "outdoor"},
         ]
 
-        for table_data in tables_data:
-            table = Table(**table_data)
-            db.add(table)
-
+        db.execute(insert(Table), tables_data)
         db.commit()
         print(f"[SUCCESS] Created {len(tables_data)} restaurant tables")
 
@@ -56,6 +55,68 @@ def create_initial_tables():
         db.close()
 
 
+def _bulk_insert(model, rows, batch_size, label):
+    """Insert rows of one model in a single transaction, batch_size rows per INSERT."""
+    db = SessionLocal()
+    try:
+        # Bulk INSERT (insertmanyvalues) instead of one ORM add per row
+        for start in range(0, len(rows), batch_size):
+            db.execute(insert(model), rows[start:start + batch_size])
+
+        db.commit()
+        print(f"[SUCCESS] Imported {len(rows)} {label}")
+        return len(rows)
+
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] Error importing {label}: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+def seed_reservations(rows, batch_size=1000):
+    """
+    Bulk-import reservations in a single transaction.
+
+    Args:
+        rows: List of dicts with Reservation column values
+        batch_size: Number of rows sent per INSERT batch
+
+    Returns:
+        Number of reservations inserted
+    """
+    return _bulk_insert(Reservation, rows, batch_size, "reservations")
+
+
+def seed_menu_items(rows, batch_size=1000):
+    """
+    Bulk-import menu items in a single transaction.
+
+    Args:
+        rows: List of dicts with MenuItem column values
+        batch_size: Number of rows sent per INSERT batch
+
+    Returns:
+        Number of menu items inserted
+    """
+    return _bulk_insert(MenuItem, rows, batch_size, "menu items")
+
+
+def seed_clients(rows, batch_size=1000):
+    """
+    Bulk-import clients in a single transaction.
+
+    Args:
+        rows: List of dicts with Client column values
+        batch_size: Number of rows sent per INSERT batch
+
+    Returns:
+        Number of clients inserted
+    """
+    return _bulk_insert(Client, rows, batch_size, "clients")
+
+
 def main():
     """Main initialization function."""
     print("=" * 60)
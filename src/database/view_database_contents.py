@@ -5,9 +5,7 @@ Displays all data from all tables in the restaurant database
 
 import sys
 import os
-
-# Disable SQLAlchemy echo before importing db_config
-os.environ['SQLALCHEMY_SILENCE'] = '1'
+from itertools import groupby
 
 import logging
 logging.basicConfig()
@@ -15,18 +13,30 @@ logging.getLogger('sqlalchemy').setLevel(logging.ERROR)
 
 from datetime import datetime
 from tabulate import tabulate
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, selectinload
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Monkey patch to disable echo
-import db_config as db_config_module
-db_config_module.engine.echo = False
-
 from db_config import SessionLocal, test_connection
 from database import Client, Reservation, Table, MenuItem, Order, OrderItem
 
 
+def _trunc(s, n=30):
+    """Shorten s to n characters followed by '...' ('' for None)."""
+    return (s[:n] + "...") if s and len(s) > n else (s or "")
+
+
+# Above this many rows, drop the grid borders ("simple" is much cheaper to render)
+_GRID_MAX_ROWS = 50
+
+
+def _table(data, headers):
+    """Render rows with tabulate: grid for small tables, simple for large ones."""
+    return tabulate(data, headers=headers, tablefmt="grid" if len(data) < _GRID_MAX_ROWS else "simple")
+
+
 def print_header(title):
     """Print a formatted header"""
     print("\n" + "="*80)
@@ -57,7 +67,7 @@ def view_clients():
             ])
         
         headers = ["ID", "Name", "Phone", "Email", "Created"]
-        print(tabulate(data, headers=headers, tablefmt="grid"))
+        print(_table(data, headers))
         print(f"\nTotal: {len(clients)} client(s)")
         
     except Exception as e:
@@ -90,7 +100,7 @@ def view_tables():
             ])
         
         headers = ["ID", "Table #", "Capacity", "Location", "Status"]
-        print(tabulate(data, headers=headers, tablefmt="grid"))
+        print(_table(data, headers))
         print(f"\nTotal: {len(tables)} table(s)")
         
     except Exception as e:
@@ -105,7 +115,12 @@ def view_reservations():
     
     db = SessionLocal()
     try:
-        reservations = db.query(Reservation).all()
+        # Eager-load client and table in the same query (no lazy load per row)
+        reservations = (
+            db.query(Reservation)
+            .options(joinedload(Reservation.client), joinedload(Reservation.table))
+            .all()
+        )
         
         if not reservations:
             print("No reservations found.")
@@ -124,11 +139,11 @@ def view_reservations():
                 res.time,
                 res.num_guests,
                 res.status,
-                res.special_requests[:30] + "..." if res.special_requests and len(res.special_requests) > 30 else (res.special_requests or "")
+                _trunc(res.special_requests)
             ])
         
         headers = ["ID", "Client", "Phone", "Table", "Date", "Time", "Guests", "Status", "Special Requests"]
-        print(tabulate(data, headers=headers, tablefmt="grid"))
+        print(_table(data, headers))
         print(f"\nTotal: {len(reservations)} reservation(s)")
         
     except Exception as e:
@@ -143,20 +158,14 @@ def view_menu_items():
     
     db = SessionLocal()
     try:
-        menu_items = db.query(MenuItem).all()
+        # Sorted by the database, grouped as we iterate
+        menu_items = db.query(MenuItem).order_by(MenuItem.category, MenuItem.name).all()
         
         if not menu_items:
             print("No menu items found.")
             return
         
-        # Group by category
-        categories = {}
-        for item in menu_items:
-            if item.category not in categories:
-                categories[item.category] = []
-            categories[item.category].append(item)
-        
-        for category, items in sorted(categories.items()):
+        for category, items in groupby(menu_items, key=lambda item: item.category):
             print(f"\n{category.upper()}")
             print("-" * 80)
             
@@ -168,11 +177,11 @@ def view_menu_items():
                     item.name,
                     f"${item.price:.2f}",
                     available,
-                    item.description[:40] + "..." if item.description and len(item.description) > 40 else (item.description or "")
+                    _trunc(item.description, 40)
                 ])
             
             headers = ["ID", "Name", "Price", "Available", "Description"]
-            print(tabulate(data, headers=headers, tablefmt="grid"))
+            print(_table(data, headers))
         
         print(f"\n\nTotal: {len(menu_items)} menu item(s)")
         
@@ -188,7 +197,13 @@ def view_orders():
     
     db = SessionLocal()
     try:
-        orders = db.query(Order).order_by(Order.created_at.desc()).all()
+        # Orders, their items and the items' menu entries in 2 queries (no per-order lookups)
+        orders = (
+            db.query(Order)
+            .options(selectinload(Order.items).joinedload(OrderItem.menu_item))
+            .order_by(Order.created_at.desc())
+            .all()
+        )
         
         if not orders:
             print("No orders found.")
@@ -208,16 +223,14 @@ def view_orders():
             if order.special_instructions:
                 print(f"Instructions: {order.special_instructions}")
             
-            # Get order items
-            order_items = db.query(OrderItem).filter(OrderItem.order_id == order.id).all()
+            order_items = order.items
             
             if order_items:
                 print(f"\nItems:")
                 items_data = []
                 for item in order_items:
-                    menu_item = db.query(MenuItem).filter(MenuItem.id == item.menu_item_id).first()
-                    item_name = menu_item.name if menu_item else "Unknown Item"
-                    special = item.special_requests[:30] + "..." if item.special_requests and len(item.special_requests) > 30 else (item.special_requests or "")
+                    item_name = item.menu_item.name if item.menu_item else "Unknown Item"
+                    special = _trunc(item.special_requests)
                     items_data.append([
                         item_name,
                         item.quantity,
@@ -227,7 +240,7 @@ def view_orders():
                     ])
                 
                 headers = ["Item", "Qty", "Unit Price", "Subtotal", "Special Requests"]
-                print(tabulate(items_data, headers=headers, tablefmt="grid"))
+                print(_table(items_data, headers))
             else:
                 print("\nNo items in this order.")
             
@@ -247,38 +260,35 @@ def view_statistics():
     
     db = SessionLocal()
     try:
-        stats = []
-        
-        # Count records in each table
-        stats.append(["Clients", db.query(Client).count()])
-        stats.append(["Tables", db.query(Table).count()])
-        stats.append(["Reservations", db.query(Reservation).count()])
-        stats.append(["Menu Items", db.query(MenuItem).count()])
-        stats.append(["Orders", db.query(Order).count()])
-        stats.append(["Order Items", db.query(OrderItem).count()])
-        
-        # Reservation stats
-        active_reservations = db.query(Reservation).filter(Reservation.status == "booked").count()
-        stats.append(["Active Reservations", active_reservations])
-        
-        # Order stats
-        preparing_orders = db.query(Order).filter(Order.status == "preparing").count()
-        ready_orders = db.query(Order).filter(Order.status == "ready").count()
-        stats.append(["Preparing Orders", preparing_orders])
-        stats.append(["Ready Orders", ready_orders])
-        
-        # Menu stats
-        available_items = db.query(MenuItem).filter(MenuItem.is_available == True).count()
-        stats.append(["Available Menu Items", available_items])
-        
-        # Revenue (total from all orders)
-        total_revenue = db.query(Order).filter(Order.status.in_(["ready", "delivered"])).with_entities(
-            db.func.sum(Order.total_amount)
-        ).scalar() or 0
-        stats.append(["Total Revenue", f"${total_revenue:.2f}"])
+        def count(model, *conditions):
+            return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+        
+        # Every metric in a single round trip (one scalar subquery per column)
+        row = db.execute(select(
+            count(Client),
+            count(Table),
+            count(Reservation),
+            count(MenuItem),
+            count(Order),
+            count(OrderItem),
+            count(Reservation, Reservation.status == "booked"),
+            count(Order, Order.status == "preparing"),
+            count(Order, Order.status == "ready"),
+            count(MenuItem, MenuItem.is_available == True),
+            select(func.coalesce(func.sum(Order.total_amount), 0))
+                .where(Order.status.in_(["ready", "delivered"]))
+                .scalar_subquery(),
+        )).one()
+        
+        labels = [
+            "Clients", "Tables", "Reservations", "Menu Items", "Orders", "Order Items",
+            "Active Reservations", "Preparing Orders", "Ready Orders", "Available Menu Items",
+        ]
+        stats = [[label, value] for label, value in zip(labels, row)]
+        stats.append(["Total Revenue", f"${row[-1]:.2f}"])
         
         headers = ["Metric", "Value"]
-        print(tabulate(stats, headers=headers, tablefmt="grid"))
+        print(_table(stats, headers))
         
     except Exception as e:
         print(f"Error: {e}")
@@ -325,7 +335,6 @@ def add_menu_item():
         
         db.add(new_item)
         db.commit()
-        db.refresh(new_item)
         
         print(f"\n✓ Menu item '{name}' added successfully with ID {new_item.id}!")
         
@@ -395,7 +404,6 @@ def add_client():
         
         db.add(new_client)
         db.commit()
-        db.refresh(new_client)
         
         print(f"\n✓ Client '{name}' added successfully with ID {new_client.id}!")
         
@@ -449,7 +457,6 @@ def add_order():
         
         db.add(new_order)
         db.commit()
-        db.refresh(new_order)
         
         print(f"\n✓ Order #{new_order.id} created successfully!")
         
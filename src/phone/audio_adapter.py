@@ -3,11 +3,16 @@ Adaptateur pour convertir les formats audio entre Twilio et les modules audio lo
 """
 
 import os
+import mmap
+import asyncio
 import requests
 import tempfile
 from typing import Optional
 from src.audio.speech_to_text import SpeechToText
 
+# Taille des blocs lus sur le flux HTTP
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class AudioAdapter:
     """Adapts audio formats between Twilio and the local system."""
@@ -37,18 +42,25 @@ class AudioAdapter:
             # Use Twilio authentication to retrieve info
             account_sid = os.getenv('TWILIO_ACCOUNT_SID')
             auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-            # Download the file
-            response = requests.get(
-                recording_url, 
-                auth=(account_sid, auth_token),  # ← FIX ICI
-                timeout=30
-            )
-            
             # Sauvegarder temporairement
             temp_file = os.path.join(self.temp_dir, f"twilio_recording_{os.urandom(8).hex()}.wav")
             
-            with open(temp_file, 'wb') as f:
-                f.write(response.content)
+            # Stream the download to disk chunk by chunk (the whole .wav is never held in memory)
+            with requests.get(
+                recording_url, 
+                auth=(account_sid, auth_token),  # ← FIX ICI
+                timeout=30,
+                stream=True
+            ) as response:
+                length = int(response.headers.get('Content-Length') or 0)
+                chunks = response.iter_content(_DOWNLOAD_CHUNK_SIZE)
+                # Compressed responses decode to more bytes than Content-Length: plain write
+                if length > 0 and not response.headers.get('Content-Encoding'):
+                    self._write_mmap(temp_file, chunks, length)
+                else:
+                    with open(temp_file, 'wb') as f:
+                        for chunk in chunks:
+                            f.write(chunk)
             
             print(f"Enregistrement téléchargé: {temp_file}")
             return temp_file
@@ -57,6 +69,40 @@ class AudioAdapter:
             print(f"Erreur lors du téléchargement: {e}")
             raise
     
+    @staticmethod
+    def _write_mmap(path: str, chunks, length: int):
+        """
+        Écrit les blocs dans un fichier pré-dimensionné via mmap (copie directe
+        dans le page cache, sans tampon Python intermédiaire).
+        
+        Args:
+            path: Fichier de destination
+            chunks: Itérateur de blocs bytes
+            length: Taille annoncée (Content-Length)
+        
+        Raises:
+            IOError: le flux ne fait pas exactement length octets (le fichier est supprimé)
+        """
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        complete = False
+        try:
+            os.ftruncate(fd, length)
+            written = 0
+            with mmap.mmap(fd, length) as mm:
+                for chunk in chunks:
+                    if written + len(chunk) > length:
+                        raise IOError(f"Téléchargement plus long que annoncé (Content-Length: {length} octets)")
+                    mm[written:written + len(chunk)] = chunk
+                    written += len(chunk)
+                mm.flush()
+            if written != length:
+                raise IOError(f"Téléchargement incomplet: {written} octets reçus sur {length} annoncés")
+            complete = True
+        finally:
+            os.close(fd)
+            if not complete:  # Pas de fichier tronqué ou mal dimensionné laissé derrière
+                os.remove(path)
+    
     def transcribe_audio(self, audio_file_path: str) -> Optional[str]:
         """
         Transcrit un fichier audio en texte.
@@ -83,6 +129,33 @@ class AudioAdapter:
             print(f"Erreur lors de la transcription: {e}")
             return None
     
+    async def transcribe_audio_async(self, audio_file_path: str) -> Optional[str]:
+        """
+        Variante asynchrone de transcribe_audio : en ligne, l'appel réseau est attendu
+        sans bloquer la boucle d'événements (le modèle local tourne dans un thread).
+        
+        Args:
+            audio_file_path: Chemin du fichier audio
+            
+        Returns:
+            Texte transcrit ou None en cas d'erreur
+        """
+        try:
+            if self.isOffline :
+                transcription = await asyncio.to_thread(self.stt.transcribe_offline, audio_file_path)
+            else:
+                transcription = await self.stt.transcribe_online_async(audio_file_path)
+            
+            if transcription and transcription.strip():
+                return transcription.strip()
+            
+            print("Transcription vide")
+            return None
+            
+        except Exception as e:
+            print(f"Erreur lors de la transcription: {e}")
+            return None
+    
     def convert_to_twilio_format(self, audio_file_path: str) -> str:
         """
         Convertit un fichier audio au format compatible Twilio (μ-law, 8kHz).
@@ -4,6 +4,8 @@ Logique métier pour la gestion des appels.
 
 import os
 import uuid
+import asyncio
+import threading
 from typing import Dict, Any, Tuple
 from .audio_adapter import AudioAdapter
 from src.core.orchestrator import Orchestrator
@@ -21,6 +23,16 @@ class PhoneMain:
         self.tts = TextToSpeech(isOffline=False,UsePhone=True,use_custom_xtts=False)  # Use online TTS for phone
         self.language_processor = LanguageProcessor()
         self.active_calls: Dict[str, Dict[str, Any]] = {}
+        
+        # Boucle d'événements partagée par tous les appels : chaque appel tourne dans son
+        # propre thread (TwilioHandler), mais les requêtes STT/TTS de tous les appels
+        # s'entrelacent sur cette boucle au lieu de bloquer chacune un thread
+        self._io_loop = asyncio.new_event_loop()
+        threading.Thread(target=self._io_loop.run_forever, name="phone-io", daemon=True).start()
+    
+    def _run_io(self, coro):
+        """Exécute une coroutine réseau sur la boucle partagée et attend son résultat (appelé depuis le thread d'un appel)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._io_loop).result()
     
     def detect_language_and_transcribe(self, recording_url: str, call_sid: str) -> Tuple[str, str, bool]:
         """
@@ -44,7 +56,7 @@ class PhoneMain:
                 saved_lang = self.active_calls.get(call_sid, {}).get('language', 'en')
                 return None, saved_lang, False
             
-            user_text = self.audio_adapter.transcribe_audio(audio_file_path)
+            user_text = self._run_io(self.audio_adapter.transcribe_audio_async(audio_file_path))
             
             if not user_text:
                 saved_lang = self.active_calls.get(call_sid, {}).get('language', 'en')
@@ -111,18 +123,22 @@ class PhoneMain:
             Tuple (response_text, audio_file_url)
         """
         try:
-            # Translate to English
-            english_input, _ = self.language_processor.process_input(user_text)
-            print(f"Translated to EN: {english_input}")
-            
             # Retrieve history
             conversation_history = self.active_calls.get(call_sid, {}).get('history', [])
+            
+            # Translate to English (online, the request is routed in parallel)
+            english_input, _, intent, direct_answer = self.orchestrator.translate_and_classify(
+                user_text, self.language_processor, conversation_history
+            )
+            print(f"Translated to EN: {english_input}")
             #print(f"Voici l'historique actuel : \n{conversation_history}\n")
             
             # Process via orchestrator (in English)
-            english_response = self.orchestrator.process_request(
+            # (a greeting or small talk was already answered while routing)
+            english_response = direct_answer or self.orchestrator.process_request(
                 user_input=english_input,
-                conversation_history=conversation_history
+                conversation_history=conversation_history,
+                precomputed_intent=intent
             )
             
             # Translate response to detected language
@@ -139,8 +155,8 @@ class PhoneMain:
             os.makedirs(audio_dir, exist_ok=True)
             audio_path = os.path.join(audio_dir, audio_filename)
             
-            # Generate audio
-            self.tts.speak(agent_response, output_path=audio_path,language=detected_lang)
+            # Generate audio (awaited on the shared loop, concurrently with the other calls)
+            self._run_io(self.tts.speak_online_phone_async(agent_response, output_path=audio_path))
             
             # Construct URL
             base_url = os.getenv('BASE_URL', f"http://{host}")
@@ -22,6 +22,15 @@ from database.db_config import SessionLocal
 
 load_dotenv()
 
+# Menu item document template: static parts formatted once per item, optional
+# fields appended only when set, then joined (no repeated string concatenation)
+_MENU_ITEM_HEADER = "Dish: {name}. Category: {category}. "
+_MENU_ITEM_DESCRIPTION = "Description: {description}. "
+_MENU_ITEM_PRICE = "Price: ${price}. "
+_MENU_ITEM_INGREDIENTS = "Ingredients: {ingredients}. "
+_MENU_ITEM_ALLERGENS = "Allergens: {allergens}. "
+_MENU_ITEM_AVAILABLE = "Available: {available}"
+
 
 class EmbeddingsManager:
     """Simplified ChromaDB embeddings manager."""
@@ -198,21 +207,21 @@ class EmbeddingsManager:
             menu_items = db.query(MenuItem).all()
             
             for item in menu_items:
-                text = f"Dish: {item.name}. "
-                text += f"Category: {item.category}. "
+                parts = [_MENU_ITEM_HEADER.format(name=item.name, category=item.category)]
                 
                 if item.description:
-                    text += f"Description: {item.description}. "
+                    parts.append(_MENU_ITEM_DESCRIPTION.format(description=item.description))
                 
-                text += f"Price: ${item.price}. "
+                parts.append(_MENU_ITEM_PRICE.format(price=item.price))
                 
                 if item.ingredients:
-                    text += f"Ingredients: {item.ingredients}. "
+                    parts.append(_MENU_ITEM_INGREDIENTS.format(ingredients=item.ingredients))
                 
                 if item.allergens:
-                    text += f"Allergens: {item.allergens}. "
+                    parts.append(_MENU_ITEM_ALLERGENS.format(allergens=item.allergens))
                 
-                text += f"Available: {'Yes' if item.is_available else 'No'}"
+                parts.append(_MENU_ITEM_AVAILABLE.format(available='Yes' if item.is_available else 'No'))
+                text = "".join(parts)
                 
                 documents.append({
                     'id': f'menu_item_{item.id}',